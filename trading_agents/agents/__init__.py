@@ -0,0 +1,20 @@
+"""
+Pacote dos agentes LLM.
+
+O bootstrap (sys.path + .env) roda UMA vez aqui, na importação do pacote,
+em vez de ser repetido no topo de cada módulo de agente — importar N
+agentes não dispara N varreduras de disco atrás do .env.
+"""
+
+import os
+import sys
+
+# Garante que a raiz do projeto (trading_agents/) está no sys.path para os
+# imports absolutos (models.*, data.*) funcionarem em qualquer contexto
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from agents._env import ensure_env
+
+OPENAI_API_KEY = ensure_env()
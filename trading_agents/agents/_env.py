@@ -0,0 +1,43 @@
+"""
+Carregamento único das variáveis de ambiente dos agentes.
+
+Cada módulo de agente importava e re-executava o bloco find_dotenv/load_dotenv
+no topo do arquivo, repetindo a varredura de diretórios a cada import. Aqui o
+carregamento acontece no máximo uma vez por processo, e só quando a key ainda
+não está em os.environ.
+"""
+
+import os
+import functools
+from pathlib import Path
+
+from dotenv import load_dotenv, find_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_env() -> str:
+    """
+    Garante que a OPENAI_API_KEY está carregada, lendo o .env se necessário.
+
+    Returns:
+        A API key validada (sem espaços)
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        # Carrega o .env de forma robusta
+        env_path = find_dotenv(usecwd=True)  # procura a partir do CWD do processo
+        if not env_path:  # se não encontrou, force o caminho relativo ao arquivo atual
+            env_path = Path(__file__).resolve().parent.parent / ".env"
+        load_dotenv(dotenv_path=env_path, override=True)
+        api_key = os.getenv("OPENAI_API_KEY")
+
+    # Valida se a API key foi carregada
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY não encontrada no .env!")
+
+    # Remove espaços
+    api_key = api_key.strip()
+    os.environ["OPENAI_API_KEY"] = api_key
+
+    return api_key
@@ -0,0 +1,42 @@
+"""
+Cliente HTTP compartilhado entre os agentes.
+
+Cada OpenAIChat criava seu próprio cliente, então cada agente pagava o
+handshake TLS e abria conexões próprias para api.openai.com. Um único
+AsyncClient com HTTP/2 e pool de conexões keep-alive multiplexa as chamadas
+de Bear, Bull e Senior nas mesmas conexões.
+"""
+
+import asyncio
+import atexit
+import functools
+
+import httpx
+
+
+@functools.lru_cache(maxsize=1)
+def shared_client() -> httpx.AsyncClient:
+    """
+    AsyncClient único do processo (HTTP/2 + pool keep-alive).
+
+    Returns:
+        httpx.AsyncClient compartilhado por todos os agentes
+    """
+    client = httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+    atexit.register(_close_client)
+    return client
+
+
+def _close_client():
+    """Fecha o cliente compartilhado no encerramento do processo."""
+    client = shared_client()
+    if not client.is_closed:
+        try:
+            asyncio.run(client.aclose())
+        except RuntimeError:
+            # Já existe um event loop rodando no shutdown; deixa o GC fechar
+            pass
@@ -0,0 +1,65 @@
+"""
+Limitador de taxa compartilhado (RPM + TPM) para as chamadas ao LLM.
+
+Sem isso, o fan-out concorrente de Bear+Bull+Senior estoura a cota da
+OpenAI e vira tempestade de 429 + backoff, destruindo o throughput. Dois
+token buckets (requisições/min e tokens/min) mantêm a utilização perto de
+100% da cota sem provocar throttling do servidor.
+"""
+
+import asyncio
+import os
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket assíncrono com recarga contínua.
+
+    capacity tokens por period_s segundos; acquire(n) espera o necessário
+    até haver n tokens disponíveis.
+    """
+
+    def __init__(self, capacity: float, period_s: float = 60.0):
+        self.capacity = float(capacity)
+        self.period_s = period_s
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        rate = self.capacity / self.period_s
+        self._tokens = min(self.capacity, self._tokens + elapsed * rate)
+
+    async def acquire(self, amount: float = 1.0):
+        """Consome `amount` tokens, dormindo até o bucket recarregar se preciso."""
+        # Nunca exige mais que a capacidade (senão esperaria para sempre)
+        amount = min(amount, self.capacity)
+        rate = self.capacity / self.period_s
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / rate)
+
+
+# Cotas configuráveis por env (padrões conservadores de tier pago)
+_RPM = TokenBucket(float(os.getenv("OPENAI_RPM", "500")))
+_TPM = TokenBucket(float(os.getenv("OPENAI_TPM", "800000")))
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Estimativa barata de tokens (~4 chars/token) para o bucket de TPM."""
+    return len(prompt) // 4 + 1
+
+
+async def acquire_llm_slot(prompt: str):
+    """Aguarda orçamento de RPM e TPM antes de enviar uma chamada ao LLM."""
+    await _RPM.acquire(1.0)
+    await _TPM.acquire(estimate_tokens(prompt))
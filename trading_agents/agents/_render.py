@@ -0,0 +1,56 @@
+"""
+Renderização memoizada de blocos de prompt compartilhados entre agentes.
+
+Bear, Bull e Senior recebem o MESMO snapshot do analista e re-serializavam o
+dict inteiro em cada chamada. Aqui o texto indentado é renderizado uma única
+vez por (ticker, as_of, bytes) e reaproveitado pelos três agentes.
+"""
+
+import functools
+import json
+
+# orjson (C) serializa/parseia bem mais rápido que a stdlib; se não estiver
+# instalado, cai para o json padrão com a mesma assinatura.
+try:
+    import orjson
+
+    def snapshot_bytes(snapshot: dict) -> bytes:
+        """Serialização compacta (e hashável) do snapshot, usada como chave de cache."""
+        return orjson.dumps(snapshot, option=orjson.OPT_NON_STR_KEYS)
+
+    def _indent_json(raw: bytes) -> str:
+        return orjson.dumps(
+            orjson.loads(raw),
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+except ImportError:
+    def snapshot_bytes(snapshot: dict) -> bytes:
+        return json.dumps(snapshot, ensure_ascii=False).encode()
+
+    def _indent_json(raw: bytes) -> str:
+        return json.dumps(json.loads(raw), indent=2, ensure_ascii=False)
+
+
+def bullets(items) -> str:
+    """
+    Lista de strings como bullets "  • ...".
+
+    Join com separador literal é mais barato que gerador + chr(10) por item.
+    """
+    return "  • " + "\n  • ".join(items)
+
+
+@functools.lru_cache(maxsize=4096)
+def render_snapshot(ticker: str, as_of: str, snap_bytes: bytes) -> str:
+    """
+    Texto JSON indentado do snapshot, memoizado por (ticker, as_of, bytes).
+
+    Args:
+        ticker: Ticker do ativo (chave de cache)
+        as_of: Data de referência (chave de cache)
+        snap_bytes: Snapshot serializado via snapshot_bytes()
+
+    Returns:
+        JSON indentado pronto para entrar no prompt
+    """
+    return _indent_json(snap_bytes)
@@ -0,0 +1,30 @@
+"""
+Política de retry compartilhada para as chamadas ao LLM.
+
+Um único 429/500 transitório da OpenAI derrubava o lote inteiro do
+orquestrador. O decorator llm_retry re-tenta com backoff exponencial +
+jitter (evita thundering herd quando o RPM estoura), mas só para erros
+transitórios — BadRequestError (ex.: prompt longo demais) falha na hora.
+"""
+
+import openai
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+# Erros em que vale re-tentar; o resto é permanente e propaga direto
+_RETRYABLE = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+)
+
+llm_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    retry=retry_if_exception_type(_RETRYABLE),
+    reraise=True,
+)
@@ -1,306 +1,563 @@
-"""
-Agente Pessimista (Bear) - Analisa riscos e cenários negativos.
-"""
-
-# ============ IMPORTS E CONFIGURAÇÃO DE PATH ============
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# ============ CARREGA VARIÁVEIS DE AMBIENTE ============
-# Carrega .env da raiz do projeto
-from pathlib import Path
-from dotenv import load_dotenv, find_dotenv
-# Carrega o .env de forma robusta
-env_path = find_dotenv(usecwd=True)  # procura a partir do CWD do processo
-if not env_path:  # se não encontrou, force o caminho relativo ao arquivo atual
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
-
-# Valida se a API key foi carregada
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY não encontrada no .env!")
-
-# Remove espaços
-OPENAI_API_KEY = OPENAI_API_KEY.strip()
-
-# ============ IMPORTS DO PROJETO ============
-import json
-from typing import Optional
-from datetime import datetime
-
-from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-
-from models.schemas import BearPerspective, FundamentalReport, Verdict
-
-
-# ============ PROMPT DO AGENTE BEAR ============
-
-BEAR_INSTRUCTIONS = """
-Você é um **Analista Bearish (Pessimista) Sênior** com 20 anos de experiência em identificar riscos e problemas em empresas.
-
-## SUA MISSÃO:
-Analisar CRITICAMENTE o relatório do analista fundamental e os dados da empresa, focando em:
-- Riscos estruturais e conjunturais
-- Vulnerabilidades financeiras
-- Ameaças competitivas e de mercado
-- Sinais de deterioração
-- Fatores que podem levar a perdas
-
-## PROTOCOLO DE ANÁLISE:
-
-### 1. Analise os Dados Fornecidos
-Você receberá:
-- Relatório completo do Analista Fundamental
-- Snapshot com dados financeiros brutos
-- Score e subscores de valuation/quality/risk
-
-### 2. Identifique Preocupações Específicas (concerns)
-Liste 5-7 preocupações CONCRETAS baseadas nos dados:
-- Se P/E alto: "P/E de X está Y% acima da média, indicando sobrevalorização"
-- Se dívida alta: "D/E de X indica alto risco de alavancagem"
-- Se margens caindo: "Margem líquida caiu Z% YoY, sinalizando pressão competitiva"
-
-**REGRAS:**
-- Cite NÚMEROS EXATOS dos dados
-- Cada concern deve ter evidência quantitativa
-- Evite generalidades ("mercado pode cair" ❌) → seja específico ("ROE de 8% vs 15% do setor indica ineficiência" ✅)
-
-### 3. Cenário Pessimista (worst_case_scenario)
-Construa uma narrativa do PIOR CENÁRIO plausível (2-3 parágrafos):
-- O que pode dar errado?
-- Encadeamento de eventos negativos
-- Impacto estimado no preço/fundamentals
-- Baseie-se nos dados reais fornecidos
-
-### 4. Probabilidades e Estimativas
-- **downside_probability** (0-1): Quão provável é o cenário negativo?
-  * 0.7-1.0: Altamente provável, dados críticos
-  * 0.4-0.7: Moderadamente provável, alguns red flags
-  * 0.0-0.4: Pouco provável, mas riscos existem
-
-- **estimated_downside** (% negativo): Queda estimada no pior caso
-  * Ex: -15.5 significa queda de 15.5%
-  * Base em múltiplos setoriais, histórico de stress
-
-### 5. Recomendação
-- **recommended_action**: SELL (se riscos críticos) | HOLD (se moderados) | BUY (só se upside compensar riscos)
-- **confidence** (0-1): Sua confiança na análise
-
-### 6. Evidências do Analista
-Liste 3-5 pontos ESPECÍFICOS do relatório do analista que suportam sua visão bearish.
-Cite textualmente se possível.
-
-### 7. Métricas-Chave Analisadas
-Destaque as métricas que mais pesaram na análise:
-```json
-{
-  "pe_ratio": 45.2,
-  "debt_to_equity": 2.1,
-  "roe": 0.08,
-  "current_ratio": 0.7
-}
-```
-
-## FORMATO DE SAÍDA:
-Retorne JSON seguindo EXATAMENTE o schema BearPerspective.
-
-## EXEMPLO:
-```json
-{
-  "ticker": "XPTO4.SA",
-  "as_of": "2024-03-29",
-  "concerns": [
-    "P/E de 45x está 80% acima da média do setor de 25x, indicando sobrevalorização extrema",
-    "D/E de 2.1x sugere alto risco de insolvência em cenário de alta de juros",
-    "Margem líquida de 8% caiu 30% YoY, sinalizando pressão competitiva intensa",
-    "Current ratio de 0.7 indica problemas de liquidez de curto prazo",
-    "ROE de 8% está 47% abaixo da média setorial de 15%, indicando baixa eficiência"
-  ],
-  "worst_case_scenario": "No pior cenário, a empresa enfrenta aperto de liquidez devido ao current ratio baixo (0.7), forçando renegociação de dívidas a taxas mais altas. Com D/E de 2.1x e juros subindo, o custo de capital pode dobrar, comprimindo ainda mais as margens já pressionadas (queda de 30% YoY). A sobrevalorização (P/E 80% acima do setor) torna o papel vulnerável a correção abrupta. Em cenário de recessão, combinando deterioração de margens, problemas de liquidez e múltiplos insustentáveis, o papel pode cair 40-50% até atingir P/E de 25x (média setorial).",
-  "downside_probability": 0.65,
-  "estimated_downside": -45.0,
-  "recommended_action": "sell",
-  "confidence": 0.75,
-  "evidence_from_analyst": [
-    "Analista identificou 'D/E de 2.1x indica alto risco financeiro'",
-    "Score de valuation foi 0.0, indicando empresa cara",
-    "Analista alertou: 'Pressão competitiva pode comprimir margens'"
-  ],
-  "key_metrics_analyzed": {
-    "pe_ratio": 45.2,
-    "debt_to_equity": 2.1,
-    "net_margin": 0.08,
-    "roe": 0.08,
-    "current_ratio": 0.7
-  }
-}
-```
-
-## REGRAS CRÍTICAS:
-- Use APENAS dados fornecidos
-- Cite números EXATOS
-- Seja PESSIMISTA mas REALISTA
-- Cada afirmação deve ter evidência quantitativa
-- JSON puro, sem markdown
-"""
-
-
-# ============ AGENTE ============
-
-bear_agent = Agent(
-    name="BearAnalyst",
-    model=OpenAIChat(id="gpt-4o-mini"),
-    instructions=BEAR_INSTRUCTIONS,
-)
-
-
-# ============ ORCHESTRATOR ============
-
-def run_bear(
-    analyst_report: FundamentalReport,
-    verbose: bool = True
-) -> BearPerspective:
-    """
-    Executa análise pessimista baseada no relatório do analista.
-    
-    Args:
-        analyst_report: Relatório do analista fundamental
-        verbose: Se True, imprime progresso
-    
-    Returns:
-        BearPerspective com análise pessimista
-    """
-    
-    if verbose:
-        print(f"\n🐻 Analisando perspectiva BEARISH para {analyst_report.ticker}...")
-    
-    # Prepara contexto para o agente
-    prompt = f"""
-Analise os dados abaixo sob uma perspectiva PESSIMISTA e identifique todos os riscos e vulnerabilidades.
-
-# RELATÓRIO DO ANALISTA FUNDAMENTAL
-
-**Ticker:** {analyst_report.ticker}
-**Data:** {analyst_report.as_of}
-**Veredito do Analista:** {analyst_report.verdict.value.upper()}
-**Score:** {analyst_report.score:.1f}/100 (confiança: {analyst_report.confidence:.0%})
-
-**Summary:**
-{analyst_report.summary}
-
-**Rationale:**
-{chr(10).join(f"  • {r}" for r in analyst_report.rationale)}
-
-**Risks identificados:**
-{chr(10).join(f"  • {r}" for r in analyst_report.risks)}
-
-# DADOS FINANCEIROS BRUTOS
-
-{json.dumps(analyst_report.snapshot, indent=2, ensure_ascii=False)}
-
----
-
-Gere a análise bearish em JSON seguindo o schema BearPerspective.
-Foque nos RISCOS e no que pode dar ERRADO.
-"""
-    
-    if verbose:
-        print("   Gerando análise pessimista via LLM...")
-    
-    response = bear_agent.run(prompt)
-    
-    # Parse da resposta
-    try:
-        content = str(response.content)
-        
-        # Remove markdown
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        # Parse JSON
-        bear_dict = json.loads(content)
-        
-        # Valida com Pydantic
-        bear_perspective = BearPerspective(**bear_dict)
-        
-        if verbose:
-            print(f"   ✅ Análise concluída: {bear_perspective.recommended_action.value.upper()}")
-            print(f"      Downside: {bear_perspective.estimated_downside:.1f}%")
-            print(f"      Probabilidade: {bear_perspective.downside_probability:.0%}")
-            print(f"      Confiança: {bear_perspective.confidence:.0%}")
-        
-        return bear_perspective
-        
-    except Exception as e:
-        if verbose:
-            print(f"   ❌ Erro ao parsear resposta: {e}")
-        
-        raise ValueError(
-            f"Falha ao parsear resposta do agente Bear: {e}\n"
-            f"Resposta bruta: {str(response.content)[:500]}"
-        )
-
-
-# ============ TESTE STANDALONE ============
-
-if __name__ == "__main__":
-    # Para testar, precisa de um relatório do analista
-    print("⚠️ Este agente precisa de um FundamentalReport como input.")
-    print("   Execute via orchestrator.py ou crie um report manualmente para teste.")
-    
-    # Exemplo de teste com dados mock:
-    from models.schemas import FundamentalSnapshot
-    
-    mock_snapshot = {
-        "ticker": "TEST4.SA",
-        "as_of": "2024-03-29",
-        "price": 50.0,
-        "pe": 45.0,
-        "debt_to_equity": 2.1,
-        "net_margin": 0.08,
-        "roe": 0.08,
-        "current_ratio": 0.7,
-        "evidence": ["mock_data"]
-    }
-    
-    mock_report = FundamentalReport(
-        ticker="TEST4.SA",
-        as_of="2024-03-29",
-        verdict=Verdict.HOLD,
-        score=55.0,
-        confidence=0.75,
-        summary="Empresa com valuation alto e margens pressionadas",
-        rationale=[
-            "P/E de 45x está acima da média",
-            "D/E de 2.1x indica alto endividamento",
-            "Margens em queda"
-        ],
-        risks=[
-            "Risco de liquidez",
-            "Pressão competitiva"
-        ],
-        snapshot=mock_snapshot
-    )
-    
-    print("\n🧪 Testando com dados mock...")
-    bear_result = run_bear(mock_report, verbose=True)
-    
-    print("\n" + "="*70)
-    print("RESULTADO DA ANÁLISE BEARISH")
-    print("="*70)
-    print(f"\n🎯 Recomendação: {bear_result.recommended_action.value.upper()}")
-    print(f"📉 Downside estimado: {bear_result.estimated_downside:.1f}%")
-    print(f"⚠️ Probabilidade: {bear_result.downside_probability:.0%}")
-    
-    print(f"\n🔍 Preocupações:")
-    for concern in bear_result.concerns:
-        print(f"   • {concern}")
-    
-    print(f"\n📖 Pior Cenário:")
-
-    print(f"   {bear_result.worst_case_scenario}")
+"""
+Agente Pessimista (Bear) - Analisa riscos e cenários negativos.
+"""
+
+# ============ BOOTSTRAP DO PACOTE ============
+import sys
+import os
+
+# Execução standalone (python agents/<nome>.py): coloca a raiz no path antes
+# de importar o pacote; via orquestrador o __init__ já fez esse trabalho
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents  # noqa: F401  (bootstrap único: sys.path + .env)
+
+# ============ IMPORTS DO PROJETO ============
+import asyncio
+import functools
+import logging
+import json
+from typing import List, Optional
+from datetime import datetime
+
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+
+from pydantic import TypeAdapter
+
+from models.schemas import BearPerspective, FundamentalReport, Verdict
+
+# Formatação de enum pré-computada: evita .value.upper() por chamada
+_VERDICT_UPPER = {v: v.value.upper() for v in Verdict}
+
+# ============ LOGGING ============
+# Logger com formatação %s preguiçosa: a string só é montada se o nível
+# estiver habilitado. verbose=True emite em INFO, verbose=False em DEBUG.
+logger = logging.getLogger(__name__)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def _lvl(verbose: bool) -> int:
+    """Nível de log correspondente ao flag verbose."""
+    return logging.INFO if verbose else logging.DEBUG
+
+from agents._http import shared_client
+from agents._limiter import acquire_llm_slot
+from agents._retry import llm_retry
+from agents._render import bullets, render_snapshot, snapshot_bytes
+
+# ============ JSON ACELERADO ============
+# orjson (C) parseia bem mais rápido que a stdlib; serialização de prompt
+# fica toda em agents/_render. Sem orjson, cai para o json padrão.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# ============ PROMPT DO AGENTE BEAR ============
+
+BEAR_INSTRUCTIONS = """
+Você é um **Analista Bearish (Pessimista) Sênior** com 20 anos de experiência em identificar riscos e problemas em empresas.
+
+## SUA MISSÃO:
+Analisar CRITICAMENTE o relatório do analista fundamental e os dados da empresa, focando em:
+- Riscos estruturais e conjunturais
+- Vulnerabilidades financeiras
+- Ameaças competitivas e de mercado
+- Sinais de deterioração
+- Fatores que podem levar a perdas
+
+## PROTOCOLO DE ANÁLISE:
+
+### 1. Analise os Dados Fornecidos
+Você receberá:
+- Relatório completo do Analista Fundamental
+- Snapshot com dados financeiros brutos
+- Score e subscores de valuation/quality/risk
+
+### 2. Identifique Preocupações Específicas (concerns)
+Liste 5-7 preocupações CONCRETAS baseadas nos dados:
+- Se P/E alto: "P/E de X está Y% acima da média, indicando sobrevalorização"
+- Se dívida alta: "D/E de X indica alto risco de alavancagem"
+- Se margens caindo: "Margem líquida caiu Z% YoY, sinalizando pressão competitiva"
+
+**REGRAS:**
+- Cite NÚMEROS EXATOS dos dados
+- Cada concern deve ter evidência quantitativa
+- Evite generalidades ("mercado pode cair" ❌) → seja específico ("ROE de 8% vs 15% do setor indica ineficiência" ✅)
+
+### 3. Cenário Pessimista (worst_case_scenario)
+Construa uma narrativa do PIOR CENÁRIO plausível (2-3 parágrafos):
+- O que pode dar errado?
+- Encadeamento de eventos negativos
+- Impacto estimado no preço/fundamentals
+- Baseie-se nos dados reais fornecidos
+
+### 4. Probabilidades e Estimativas
+- **downside_probability** (0-1): Quão provável é o cenário negativo?
+  * 0.7-1.0: Altamente provável, dados críticos
+  * 0.4-0.7: Moderadamente provável, alguns red flags
+  * 0.0-0.4: Pouco provável, mas riscos existem
+
+- **estimated_downside** (% negativo): Queda estimada no pior caso
+  * Ex: -15.5 significa queda de 15.5%
+  * Base em múltiplos setoriais, histórico de stress
+
+### 5. Recomendação
+- **recommended_action**: SELL (se riscos críticos) | HOLD (se moderados) | BUY (só se upside compensar riscos)
+- **confidence** (0-1): Sua confiança na análise
+
+### 6. Evidências do Analista
+Liste 3-5 pontos ESPECÍFICOS do relatório do analista que suportam sua visão bearish.
+Cite textualmente se possível.
+
+### 7. Métricas-Chave Analisadas
+Destaque as métricas que mais pesaram na análise:
+```json
+{
+  "pe_ratio": 45.2,
+  "debt_to_equity": 2.1,
+  "roe": 0.08,
+  "current_ratio": 0.7
+}
+```
+
+## FORMATO DE SAÍDA:
+Retorne JSON seguindo EXATAMENTE o schema BearPerspective.
+
+## EXEMPLO:
+```json
+{
+  "ticker": "XPTO4.SA",
+  "as_of": "2024-03-29",
+  "concerns": [
+    "P/E de 45x está 80% acima da média do setor de 25x, indicando sobrevalorização extrema",
+    "D/E de 2.1x sugere alto risco de insolvência em cenário de alta de juros",
+    "Margem líquida de 8% caiu 30% YoY, sinalizando pressão competitiva intensa",
+    "Current ratio de 0.7 indica problemas de liquidez de curto prazo",
+    "ROE de 8% está 47% abaixo da média setorial de 15%, indicando baixa eficiência"
+  ],
+  "worst_case_scenario": "No pior cenário, a empresa enfrenta aperto de liquidez devido ao current ratio baixo (0.7), forçando renegociação de dívidas a taxas mais altas. Com D/E de 2.1x e juros subindo, o custo de capital pode dobrar, comprimindo ainda mais as margens já pressionadas (queda de 30% YoY). A sobrevalorização (P/E 80% acima do setor) torna o papel vulnerável a correção abrupta. Em cenário de recessão, combinando deterioração de margens, problemas de liquidez e múltiplos insustentáveis, o papel pode cair 40-50% até atingir P/E de 25x (média setorial).",
+  "downside_probability": 0.65,
+  "estimated_downside": -45.0,
+  "recommended_action": "sell",
+  "confidence": 0.75,
+  "evidence_from_analyst": [
+    "Analista identificou 'D/E de 2.1x indica alto risco financeiro'",
+    "Score de valuation foi 0.0, indicando empresa cara",
+    "Analista alertou: 'Pressão competitiva pode comprimir margens'"
+  ],
+  "key_metrics_analyzed": {
+    "pe_ratio": 45.2,
+    "debt_to_equity": 2.1,
+    "net_margin": 0.08,
+    "roe": 0.08,
+    "current_ratio": 0.7
+  }
+}
+```
+
+## REGRAS CRÍTICAS:
+- Use APENAS dados fornecidos
+- Cite números EXATOS
+- Seja PESSIMISTA mas REALISTA
+- Cada afirmação deve ter evidência quantitativa
+- JSON puro, sem markdown
+"""
+
+
+# Preâmbulo/fecho estáticos do prompt de usuário.
+# IMPORTANTE: o cache automático de prompts da OpenAI só reaproveita o prefixo
+# se ele for byte-idêntico entre chamadas — BEAR_INSTRUCTIONS vai como primeira
+# mensagem system (via instructions=) e NUNCA deve receber conteúdo dinâmico;
+# o conteúdo por ticker entra só depois destes blocos fixos.
+BEAR_PROMPT_PREFIX = """
+Analise os dados abaixo sob uma perspectiva PESSIMISTA e identifique todos os riscos e vulnerabilidades.
+
+"""
+
+BEAR_PROMPT_SUFFIX = """
+
+---
+
+Gere a análise bearish em JSON seguindo o schema BearPerspective.
+Foque nos RISCOS e no que pode dar ERRADO.
+"""
+
+
+# ============ AGENTE ============
+
+@functools.lru_cache(maxsize=1)
+def _bear_agent() -> Agent:
+    """
+    Singleton preguiçoso do agente Bear.
+
+    Construir o Agent (e o cliente OpenAI por trás) só na primeira chamada
+    evita pagar a inicialização do SDK quando o módulo é importado apenas
+    para type hints ou testes.
+    """
+    return Agent(
+        name="BearAnalyst",
+        model=OpenAIChat(
+            id="gpt-4o-mini",
+            http_client=shared_client(),
+            # JSON mode estrito: o servidor garante saída aderente ao schema,
+            # eliminando fences markdown e retries por JSON malformado
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "BearPerspective",
+                    "schema": BearPerspective.model_json_schema(),
+                    "strict": True,
+                },
+            },
+        ),
+        instructions=BEAR_INSTRUCTIONS,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _bear_batch_agent() -> Agent:
+    """
+    Variante para o caminho marshalled: o schema estrito não aceita arrays,
+    então o lote usa json_object e embrulha o array em {"perspectives": [...]}.
+    """
+    return Agent(
+        name="BearAnalyst",
+        model=OpenAIChat(
+            id="gpt-4o-mini",
+            http_client=shared_client(),
+            response_format={"type": "json_object"},
+        ),
+        instructions=BEAR_INSTRUCTIONS,
+    )
+
+
+# ============ CONCORRÊNCIA ============
+# Limita o número de chamadas simultâneas à API (evita estourar o RPM)
+_SEM = asyncio.Semaphore(int(os.getenv("BEAR_CONCURRENCY", "8")))
+
+
+# ============ HELPERS ============
+
+# Valida o array inteiro de uma vez no validador compilado do pydantic-core,
+# em vez de expandir kwargs item a item no caminho marshalled
+_BEAR_LIST = TypeAdapter(List[BearPerspective])
+
+def _report_block(analyst_report: FundamentalReport) -> str:
+    """
+    Bloco de contexto de um ticker (relatório do analista + snapshot).
+    """
+    # Renderização memoizada: o Senior reaproveita o mesmo texto depois
+    snapshot_text = render_snapshot(
+        analyst_report.ticker,
+        str(analyst_report.as_of),
+        snapshot_bytes(analyst_report.snapshot),
+    )
+    return f"""# RELATÓRIO DO ANALISTA FUNDAMENTAL
+
+**Ticker:** {analyst_report.ticker}
+**Data:** {analyst_report.as_of}
+**Veredito do Analista:** {_VERDICT_UPPER[analyst_report.verdict]}
+**Score:** {analyst_report.score:.1f}/100 (confiança: {analyst_report.confidence:.0%})
+
+**Summary:**
+{analyst_report.summary}
+
+**Rationale:**
+{bullets(analyst_report.rationale)}
+
+**Risks identificados:**
+{bullets(analyst_report.risks)}
+
+# DADOS FINANCEIROS BRUTOS
+
+{snapshot_text}"""
+
+
+def _build_bear_prompt(analyst_report: FundamentalReport) -> str:
+    """
+    Monta o prompt do Bear a partir do relatório do analista.
+    Prefixo e sufixo são constantes para manter o prefixo cacheável.
+    """
+    return BEAR_PROMPT_PREFIX + _report_block(analyst_report) + BEAR_PROMPT_SUFFIX
+
+
+def _parse_bear(content: str) -> BearPerspective:
+    """
+    Extrai e valida o JSON de uma resposta do agente Bear.
+    Compartilhado entre os caminhos síncrono e assíncrono.
+    """
+    # JSON mode garante saída parseável direto, sem fence markdown
+    bear_dict = _json_loads(content)
+
+    # Valida com Pydantic (model_validate evita a expansão de kwargs)
+    return BearPerspective.model_validate(bear_dict)
+
+
+@llm_retry
+def _call_llm_batch(prompt: str):
+    """Chamada do lote com retry transitório (429/timeout/conexão)."""
+    return _bear_batch_agent().run(prompt)
+
+
+@llm_retry
+async def _acall_llm(prompt: str):
+    """Chamada assíncrona com retry transitório (429/timeout/conexão)."""
+    return await _bear_agent().arun(prompt)
+
+
+@llm_retry
+def _run_bear_streaming(prompt: str) -> BearPerspective:
+    """
+    Consome a resposta do LLM em streaming e tenta o parse assim que as
+    chaves do JSON se equilibram — a validação começa no instante em que o
+    fecha-chaves final chega, em vez de esperar o fim do stream.
+    """
+    parts: List[str] = []
+    opens = closes = 0
+
+    for event in _bear_agent().run(prompt, stream=True):
+        chunk = getattr(event, "content", None) or ""
+        if not chunk:
+            continue
+        parts.append(chunk)
+        opens += chunk.count("{")
+        closes += chunk.count("}")
+
+        # Parse antecipado quando o JSON parece completo
+        if opens and opens == closes:
+            try:
+                return _parse_bear("".join(parts))
+            except Exception:
+                pass  # fence ainda aberto ou JSON incompleto; segue consumindo
+
+    content = "".join(parts)
+    try:
+        return _parse_bear(content)
+    except Exception as e:
+        raise ValueError(
+            f"Falha ao parsear resposta do agente Bear: {e}\n"
+            f"Resposta bruta: {content[:500]}"
+        )
+
+
+# ============ ORCHESTRATOR ============
+
+def run_bear(
+    analyst_report: FundamentalReport,
+    verbose: bool = True
+) -> BearPerspective:
+    """
+    Executa análise pessimista baseada no relatório do analista.
+
+    Args:
+        analyst_report: Relatório do analista fundamental
+        verbose: Se True, imprime progresso
+
+    Returns:
+        BearPerspective com análise pessimista
+    """
+
+    logger.log(_lvl(verbose), "\n🐻 Analisando perspectiva BEARISH para %s...", analyst_report.ticker)
+
+    # Prepara contexto para o agente
+    prompt = _build_bear_prompt(analyst_report)
+
+    logger.log(_lvl(verbose), "   Gerando análise pessimista via LLM...")
+
+    # Streaming: sobrepõe o parse à latência da rede
+    try:
+        bear_perspective = _run_bear_streaming(prompt)
+    except Exception as e:
+        logger.log(_lvl(verbose), "   ❌ Erro ao parsear resposta: %s", e)
+        raise
+
+    lvl = _lvl(verbose)
+    logger.log(lvl, "   ✅ Análise concluída: %s", _VERDICT_UPPER[bear_perspective.recommended_action])
+    logger.log(lvl, "      Downside: %.1f%%", bear_perspective.estimated_downside)
+    logger.log(lvl, "      Probabilidade: %.0f%%", bear_perspective.downside_probability * 100)
+    logger.log(lvl, "      Confiança: %.0f%%", bear_perspective.confidence * 100)
+
+    return bear_perspective
+
+
+def run_bear_marshalled(
+    reports: List[FundamentalReport],
+    rows_per_call: Optional[int] = None,
+    verbose: bool = True
+) -> List[BearPerspective]:
+    """
+    Analisa vários tickers por chamada ao LLM, amortizando o custo fixo
+    das instruções (BEAR_INSTRUCTIONS) entre K relatórios.
+
+    Args:
+        reports: Lista de relatórios do analista fundamental
+        rows_per_call: Tickers por chamada (padrão: env BEAR_ROWS_PER_CALL ou 4)
+        verbose: Se True, imprime progresso
+
+    Returns:
+        Lista de BearPerspective na mesma ordem dos reports
+    """
+    if rows_per_call is None:
+        rows_per_call = int(os.getenv("BEAR_ROWS_PER_CALL", "4"))
+
+    perspectives: List[BearPerspective] = []
+
+    for start in range(0, len(reports), rows_per_call):
+        chunk = reports[start:start + rows_per_call]
+
+        if verbose:
+            logger.info("\n🐻 Analisando lote bearish: %s", ", ".join(r.ticker for r in chunk))
+
+        prompt = (
+            "Analise CADA ticker abaixo sob uma perspectiva PESSIMISTA.\n"
+            'Retorne um objeto JSON {"perspectives": [...]} com uma '
+            "BearPerspective por ticker, na MESMA ORDEM em que aparecem.\n\n"
+            + "\n\n---TICKER---\n\n".join(_report_block(r) for r in chunk)
+        )
+
+        try:
+            response = _call_llm_batch(prompt)
+            content = str(response.content)
+
+            parsed = _json_loads(content)
+            # json_object mode sempre retorna objeto; o array vem em "perspectives"
+            arr = parsed.get("perspectives") if isinstance(parsed, dict) else parsed
+            if not isinstance(arr, list) or len(arr) != len(chunk):
+                raise ValueError(
+                    f"Esperava array com {len(chunk)} itens, recebeu {type(arr).__name__}"
+                )
+
+            perspectives.extend(_BEAR_LIST.validate_python(arr))
+
+            logger.log(_lvl(verbose), "   ✅ Lote concluído (%d tickers em 1 chamada)", len(chunk))
+
+        except Exception as e:
+            # Fallback: se o JSON do lote falhou, reanalisa ticker a ticker
+            logger.log(_lvl(verbose), "   ⚠️ Lote falhou (%s), reanalisando ticker a ticker...", e)
+
+            for report in chunk:
+                perspectives.append(run_bear(report, verbose=verbose))
+
+    return perspectives
+
+
+async def run_bear_async(
+    analyst_report: FundamentalReport,
+    verbose: bool = False
+) -> BearPerspective:
+    """
+    Versão assíncrona de run_bear.
+    A chamada à API roda sob semáforo para limitar a concorrência.
+    """
+    prompt = _build_bear_prompt(analyst_report)
+
+    async with _SEM:
+        # Respeita as cotas de RPM/TPM antes de enviar
+        await acquire_llm_slot(prompt)
+        response = await _acall_llm(prompt)
+
+    try:
+        bear_perspective = _parse_bear(str(response.content))
+
+        logger.log(_lvl(verbose), "   🐻 %s: %s (downside: %.1f%%)",
+                   analyst_report.ticker,
+                   _VERDICT_UPPER[bear_perspective.recommended_action],
+                   bear_perspective.estimated_downside)
+
+        return bear_perspective
+
+    except Exception as e:
+        raise ValueError(
+            f"Falha ao parsear resposta do agente Bear: {e}\n"
+            f"Resposta bruta: {str(response.content)[:500]}"
+        )
+
+
+async def run_bear_batch(
+    reports: List[FundamentalReport],
+    verbose: bool = False
+) -> List[BearPerspective]:
+    """
+    Executa a análise bearish para vários relatórios em paralelo.
+
+    As chamadas são disparadas com asyncio.gather; o semáforo BEAR_CONCURRENCY
+    (padrão: 8) limita quantas ficam em voo ao mesmo tempo.
+
+    Args:
+        reports: Lista de relatórios do analista fundamental
+        verbose: Se True, imprime progresso por ticker
+
+    Returns:
+        Lista de BearPerspective na mesma ordem dos reports
+    """
+    logger.log(_lvl(verbose), "\n🐻 Analisando %d tickers em paralelo...", len(reports))
+
+    tasks = [run_bear_async(report, verbose=verbose) for report in reports]
+    return list(await asyncio.gather(*tasks))
+
+
+# ============ TESTE STANDALONE ============
+
+if __name__ == "__main__":
+    # Para testar, precisa de um relatório do analista
+    print("⚠️ Este agente precisa de um FundamentalReport como input.")
+    print("   Execute via orchestrator.py ou crie um report manualmente para teste.")
+    
+    # Exemplo de teste com dados mock:
+    from models.schemas import FundamentalSnapshot
+    
+    mock_snapshot = {
+        "ticker": "TEST4.SA",
+        "as_of": "2024-03-29",
+        "price": 50.0,
+        "pe": 45.0,
+        "debt_to_equity": 2.1,
+        "net_margin": 0.08,
+        "roe": 0.08,
+        "current_ratio": 0.7,
+        "evidence": ["mock_data"]
+    }
+    
+    mock_report = FundamentalReport(
+        ticker="TEST4.SA",
+        as_of="2024-03-29",
+        verdict=Verdict.HOLD,
+        score=55.0,
+        confidence=0.75,
+        summary="Empresa com valuation alto e margens pressionadas",
+        rationale=[
+            "P/E de 45x está acima da média",
+            "D/E de 2.1x indica alto endividamento",
+            "Margens em queda"
+        ],
+        risks=[
+            "Risco de liquidez",
+            "Pressão competitiva"
+        ],
+        snapshot=mock_snapshot
+    )
+    
+    print("\n🧪 Testando com dados mock...")
+    bear_result = run_bear(mock_report, verbose=True)
+    
+    print("\n" + "="*70)
+    print("RESULTADO DA ANÁLISE BEARISH")
+    print("="*70)
+    print(f"\n🎯 Recomendação: {_VERDICT_UPPER[bear_result.recommended_action]}")
+    print(f"📉 Downside estimado: {bear_result.estimated_downside:.1f}%")
+    print(f"⚠️ Probabilidade: {bear_result.downside_probability:.0%}")
+    
+    print(f"\n🔍 Preocupações:")
+    for concern in bear_result.concerns:
+        print(f"   • {concern}")
+    
+    print(f"\n📖 Pior Cenário:")
+
+    print(f"   {bear_result.worst_case_scenario}")
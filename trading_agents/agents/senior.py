@@ -1,386 +1,608 @@
-"""
-Agente Senior - Toma decisão final sintetizando todas as perspectivas.
-"""
-
-# ============ IMPORTS E CONFIGURAÇÃO DE PATH ============
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# ============ CARREGA VARIÁVEIS DE AMBIENTE ============
-# Carrega .env da raiz do projeto
-from pathlib import Path
-from dotenv import load_dotenv, find_dotenv
-# Carrega o .env de forma robusta
-env_path = find_dotenv(usecwd=True)  # procura a partir do CWD do processo
-if not env_path:  # se não encontrou, force o caminho relativo ao arquivo atual
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
-
-# Valida se a API key foi carregada
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY não encontrada no .env!")
-
-# Remove espaços
-OPENAI_API_KEY = OPENAI_API_KEY.strip()
-
-# ============ IMPORTS DO PROJETO ============
-import json
-from typing import Optional
-from datetime import datetime
-
-from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-
-from models.schemas import (
-    SeniorDecision, 
-    FundamentalReport, 
-    BearPerspective, 
-    BullPerspective,
-    Verdict
-)
-
-
-# ============ PROMPT DO AGENTE SENIOR ============
-
-SENIOR_INSTRUCTIONS = """
-Você é o **Head Trader Sênior** de um fundo quantitativo multi-bilionário, com 30 anos de experiência em gestão de portfólios institucionais.
-
-## SUA MISSÃO:
-Sintetizar TODAS as análises recebidas (Analista Fundamental, Especialista Bear, Especialista Bull) e tomar a **DECISÃO FINAL** sobre:
-- Veredito de investimento (BUY/SELL/HOLD)
-- Tamanho da posição (% do portfólio)
-- Níveis de stop-loss e take-profit
-- Horizonte de investimento
-
-## PROTOCOLO DE DECISÃO:
-
-### 1. Inputs que Você Receberá
-- **Relatório do Analista Fundamental**: Veredito, score, rationale, risks
-- **Perspectiva Bear (Pessimista)**: Concerns, worst case, downside estimado, probabilidade
-- **Perspectiva Bull (Otimista)**: Opportunities, best case, upside estimado, probabilidade
-- **Dados Financeiros Brutos**: Snapshot completo da empresa
-
-### 2. Framework de Análise
-
-#### A. Avaliação de Consenso
-- **Analista, Bear e Bull concordam?**
-  * 3 BUY → Forte convicção, posição agressiva
-  * 2 BUY + 1 HOLD → Convicção moderada, posição normal
-  * Divergência total → Cautela, posição reduzida ou HOLD
-
-#### B. Análise de Assimetria Risco-Retorno
-- **Ratio de Sharpe Esperado** = (Upside × Prob_Bull - |Downside| × Prob_Bear) / Volatilidade_Implícita
-- **Regra**: Só entre se Expected_Return > 2× Expected_Risk
-
-#### C. Qualidade dos Argumentos
-- Qual perspectiva tem evidências mais sólidas?
-- Os números sustentam a narrativa?
-- Há red flags ignorados pelo Bull?
-- Há catalisadores ignorados pelo Bear?
-
-#### D. Contexto de Portfólio
-- Diversificação setorial
-- Correlações
-- Risco agregado
-
-### 3. Determinação da Posição (position_size)
-
-**ESTRATÉGIA DE PORTFÓLIO DIVERSIFICADO:**
-
-Para manter 85-95% sempre investido com 15-25 posições:
-
-| Score Analyst | Qualidade | Position Size Base | Ajustes |
-|---------------|-----------|-------------------|---------|
-| **85-100** | Excelente | 6-8% | +1% se Bull forte |
-| **75-84** | Muito boa | 5-7% | - |
-| **65-74** | Boa | 4-6% | -1% se Bear moderado |
-| **55-64** | Razoável (HOLD) | 2-4% | -1% se liquidez baixa |
-| **45-54** | Fraca (HOLD) | 1-3% | Apenas se necessário |
-| **<45** | Ruim | 0% | SELL |
-
-**IMPORTANTE:** 
-- Para BUY signals (65+): Position size = 4-8%
-- Para HOLD signals (45-64): Position size = 2-4%
-- Com 15-20 posições, terá 85-95% investido
-- Cash (5-15%) rende SELIC automaticamente
-
----
-
-### 4. Stop Loss e Take Profit
-
-**Stop Loss:**
-
-Para estratégia buy-and-hold, **NÃO use stop loss**.
-
-**Justificativa:** 
-- Rebalanceamento mensal já funciona como proteção
-- Stop loss causa vendas prematuras em volatilidade temporária
-- Empresas boas (score 65+) se recuperam
-
-**Definir sempre:**
-```python
-stop_loss = None
-take_profit = None
-```
-
-### 5. Horizonte de Investimento
-
-- **short-term** (1-3 meses): Trades táticos, catalisadores iminentes
-- **medium-term** (3-12 meses): Tese fundamentalista sólida
-- **long-term** (>12 meses): Empresas estruturalmente fortes, múltiplos muito comprimidos
-
-**Critérios:**
-- Se Score > 75 E P/E < 10 → long-term
-- Se catalisador específico (earnings, evento) → short-term
-- Padrão → medium-term
-
-### 6. Synthesis (Narrativa da Decisão)
-
-Explique em 2-3 parágrafos:
-1. **O que pesou mais**: Qual análise foi determinante?
-2. **Como reconciliou divergências**: Se Bear e Bull discordam, como chegou ao meio-termo?
-3. **Fatores-chave**: Quais 3-5 fatores foram decisivos?
-
-### 7. Key Decision Factors
-
-Liste 3-5 fatores ESPECÍFICOS que determinaram a decisão:
-- "Assimetria 3:1 favorável (upside 45% vs downside 15%)"
-- "Consenso bullish entre os 3 agentes"
-- "P/E de 8x com ROE de 20% indica deep value"
-- "Bear identificou risco de liquidez que limita posição a 5%"
-
-### 8. Confidence
-
-Sua confiança na decisão (0-1):
-- 0.9-1.0: Convicção extrema, todos indicadores alinhados
-- 0.7-0.9: Alta convicção, pequenas ressalvas
-- 0.5-0.7: Moderada, alguns pontos de atenção
-- 0.3-0.5: Baixa, muita incerteza
-- <0.3: Muito baixa, melhor ficar de fora
-
-## FORMATO DE SAÍDA:
-Retorne JSON seguindo EXATAMENTE o schema SeniorDecision.
-
-## EXEMPLO:
-```json
-{
-  "ticker": "PETR4.SA",
-  "as_of": "2024-03-29",
-  "final_verdict": "buy",
-  "position_size": 7.5,
-  "stop_loss": 29.50,
-  "take_profit": 42.00,
-  "holding_period": "medium-term",
-  "synthesis": "A análise converge para uma oportunidade de compra com boa assimetria risco-retorno. O Analista identificou P/E de 4.2x com margens saudáveis (score 72.5), o Bull projetou upside de 35% com probabilidade de 70%, enquanto o Bear alertou para volatilidade do petróleo mas com downside limitado a -15% e probabilidade de apenas 40%. A assimetria 2.3:1 favorável (35% upside vs 15% downside, ponderado por probabilidades) justifica posição de 7.5%. O horizonte medium-term (6-9 meses) captura o rerating de múltiplos sem exposição excessiva a volatilidade de curto prazo.",
-  "key_decision_factors": [
-    "Assimetria risco-retorno 2.3:1 favorável (upside 35% prob 70% vs downside 15% prob 40%)",
-    "Consenso de compra entre Analista (BUY 72.5) e Bull (BUY upside 35%), com Bear moderado",
-    "Valuation extremamente comprimido: P/E 4.2x com ROE 28% indica deep value",
-    "Margens operacionais de 35% demonstram resiliência a choques de preço",
-    "Risco de volatilidade do petróleo limitado por hedge natural via exportações"
-  ],
-  "confidence": 0.82
-}
-```
-
-## REGRAS CRÍTICAS:
-- Seja RIGOROSO com position_size (máx 10%)
-- SEMPRE considere downside do Bear
-- NÃO ignore riscos para justificar position grande
-- Se incerteza alta (confidence < 0.6), reduza posição
-- JSON puro, sem markdown
-"""
-
-
-# ============ AGENTE ============
-
-senior_agent = Agent(
-    name="SeniorTrader",
-    model=OpenAIChat(id="gpt-4o"),  # Usa modelo mais potente para decisão final
-    instructions=SENIOR_INSTRUCTIONS,
-)
-
-
-# ============ ORCHESTRATOR ============
-
-def run_senior(
-    analyst_report: FundamentalReport,
-    bear_perspective: Optional[BearPerspective],
-    bull_perspective: Optional[BullPerspective],
-    verbose: bool = True
-) -> SeniorDecision:
-    """
-    Executa decisão final do Senior baseada em todas as análises.
-    
-    Args:
-        analyst_report: Relatório do analista fundamental
-        bear_perspective: Análise do Bear (pode ser None se falhou)
-        bull_perspective: Análise do Bull (pode ser None se falhou)
-        verbose: Se True, imprime progresso
-    
-    Returns:
-        SeniorDecision com decisão final
-    """
-    
-    if verbose:
-        print(f"\n👔 Decisão do Senior para {analyst_report.ticker}...")
-    
-    # Prepara contexto completo
-    prompt = f"""
-Você recebeu as seguintes análises para **{analyst_report.ticker}** (data: {analyst_report.as_of}):
-
-# 1. RELATÓRIO DO ANALISTA FUNDAMENTAL
-
-**Veredito:** {analyst_report.verdict.value.upper()}
-**Score:** {analyst_report.score:.1f}/100 (confiança: {analyst_report.confidence:.0%})
-
-**Summary:**
-{analyst_report.summary}
-
-**Rationale:**
-{chr(10).join(f"  • {r}" for r in analyst_report.rationale)}
-
-**Risks:**
-{chr(10).join(f"  • {r}" for r in analyst_report.risks)}
-
-**Dados Brutos (Snapshot):**
-```json
-{json.dumps(analyst_report.snapshot, indent=2, ensure_ascii=False)}
-```
-
-"""
-
-    # Adiciona Bear se disponível
-    if bear_perspective:
-        prompt += f"""
-# 2. PERSPECTIVA BEAR (PESSIMISTA)
-
-**Recomendação:** {bear_perspective.recommended_action.value.upper()}
-**Downside Estimado:** {bear_perspective.estimated_downside:.1f}%
-**Probabilidade:** {bear_perspective.downside_probability:.0%}
-**Confiança:** {bear_perspective.confidence:.0%}
-
-**Preocupações:**
-{chr(10).join(f"  • {c}" for c in bear_perspective.concerns)}
-
-**Pior Cenário:**
-{bear_perspective.worst_case_scenario}
-
-**Evidências do Analista Citadas:**
-{chr(10).join(f"  • {e}" for e in bear_perspective.evidence_from_analyst)}
-
-**Métricas-Chave Analisadas:**
-```json
-{json.dumps(bear_perspective.key_metrics_analyzed, indent=2, ensure_ascii=False)}
-```
-
-"""
-    else:
-        prompt += """
-# 2. PERSPECTIVA BEAR (PESSIMISTA)
-
-⚠️ **Análise Bear não disponível** (falha no agente)
-Prossiga com cautela extra e assuma downside conservador de -20%.
-
-"""
-
-    # Adiciona Bull se disponível
-    if bull_perspective:
-        prompt += f"""
-# 3. PERSPECTIVA BULL (OTIMISTA)
-
-**Recomendação:** {bull_perspective.recommended_action.value.upper()}
-**Upside Estimado:** +{bull_perspective.estimated_upside:.1f}%
-**Probabilidade:** {bull_perspective.upside_probability:.0%}
-**Confiança:** {bull_perspective.confidence:.0%}
-
-**Oportunidades:**
-{chr(10).join(f"  • {o}" for o in bull_perspective.opportunities)}
-
-**Melhor Cenário:**
-{bull_perspective.best_case_scenario}
-
-**Evidências do Analista Citadas:**
-{chr(10).join(f"  • {e}" for e in bull_perspective.evidence_from_analyst)}
-
-**Métricas-Chave Analisadas:**
-```json
-{json.dumps(bull_perspective.key_metrics_analyzed, indent=2, ensure_ascii=False)}
-```
-
-"""
-    else:
-        prompt += """
-# 3. PERSPECTIVA BULL (OTIMISTA)
-
-⚠️ **Análise Bull não disponível** (falha no agente)
-Prossiga com cautela extra e assuma upside conservador de +15%.
-
-"""
-
-    prompt += """
----
-
-**TAREFA:**
-Sintetize TODAS as análises acima e tome a decisão final.
-Gere o JSON seguindo o schema SeniorDecision.
-
-Considere:
-1. Consenso entre os agentes
-2. Assimetria risco-retorno (upside vs downside ponderados por probabilidades)
-3. Qualidade dos argumentos e evidências
-4. Confiança de cada agente
-5. Preço atual da ação para calcular stop_loss e take_profit
-
-Seja RIGOROSO com o position_size e REALISTA com as probabilidades.
-"""
-    
-    if verbose:
-        print("   Sintetizando todas as perspectivas...")
-    
-    response = senior_agent.run(prompt)
-    
-    # Parse da resposta
-    try:
-        content = str(response.content)
-        
-        # Remove markdown
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        # Parse JSON
-        senior_dict = json.loads(content)
-        
-        # Valida com Pydantic
-        senior_decision = SeniorDecision(**senior_dict)
-        
-        if verbose:
-            print(f"   ✅ Decisão tomada: {senior_decision.final_verdict.value.upper()}")
-            print(f"      Position Size: {senior_decision.position_size:.1f}%")
-            print(f"      Stop Loss: {senior_decision.stop_loss if senior_decision.stop_loss else 'N/A'}")
-            print(f"      Take Profit: {senior_decision.take_profit if senior_decision.take_profit else 'N/A'}")
-            print(f"      Holding Period: {senior_decision.holding_period}")
-            print(f"      Confiança: {senior_decision.confidence:.0%}")
-        
-        return senior_decision
-        
-    except Exception as e:
-        if verbose:
-            print(f"   ❌ Erro ao parsear resposta: {e}")
-        
-        raise ValueError(
-            f"Falha ao parsear resposta do agente Senior: {e}\n"
-            f"Resposta bruta: {str(response.content)[:500]}"
-        )
-
-
-# ============ TESTE STANDALONE ============
-
-if __name__ == "__main__":
-    print("⚠️ Este agente precisa de FundamentalReport + BearPerspective + BullPerspective.")
-
-    print("   Execute via orchestrator.py completo.")
+"""
+Agente Senior - Toma decisão final sintetizando todas as perspectivas.
+"""
+
+# ============ BOOTSTRAP DO PACOTE ============
+import sys
+import os
+
+# Execução standalone (python agents/<nome>.py): coloca a raiz no path antes
+# de importar o pacote; via orquestrador o __init__ já fez esse trabalho
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents  # noqa: F401  (bootstrap único: sys.path + .env)
+
+# ============ IMPORTS DO PROJETO ============
+import asyncio
+import functools
+import logging
+import json
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+
+from models.schemas import (
+    SeniorDecision,
+    FundamentalReport,
+    BearPerspective,
+    BullPerspective,
+    Verdict
+)
+from agents._http import shared_client
+from agents._limiter import acquire_llm_slot
+from agents._retry import llm_retry
+from agents._render import bullets, render_snapshot, snapshot_bytes
+
+# Formatação de enum pré-computada: evita .value.upper() por chamada
+_VERDICT_UPPER = {v: v.value.upper() for v in Verdict}
+
+# ============ LOGGING ============
+# Logger com formatação %s preguiçosa: a string só é montada se o nível
+# estiver habilitado. verbose=True emite em INFO, verbose=False em DEBUG.
+logger = logging.getLogger(__name__)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def _lvl(verbose: bool) -> int:
+    """Nível de log correspondente ao flag verbose."""
+    return logging.INFO if verbose else logging.DEBUG
+
+
+# ============ JSON ACELERADO ============
+# orjson (C) parseia bem mais rápido que a stdlib; serialização de prompt
+# fica toda em agents/_render. Sem orjson, cai para o json padrão.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# ============ PROMPT DO AGENTE SENIOR ============
+
+SENIOR_INSTRUCTIONS = """
+Você é o **Head Trader Sênior** de um fundo quantitativo multi-bilionário, com 30 anos de experiência em gestão de portfólios institucionais.
+
+## SUA MISSÃO:
+Sintetizar TODAS as análises recebidas (Analista Fundamental, Especialista Bear, Especialista Bull) e tomar a **DECISÃO FINAL** sobre:
+- Veredito de investimento (BUY/SELL/HOLD)
+- Tamanho da posição (% do portfólio)
+- Níveis de stop-loss e take-profit
+- Horizonte de investimento
+
+## PROTOCOLO DE DECISÃO:
+
+### 1. Inputs que Você Receberá
+- **Relatório do Analista Fundamental**: Veredito, score, rationale, risks
+- **Perspectiva Bear (Pessimista)**: Concerns, worst case, downside estimado, probabilidade
+- **Perspectiva Bull (Otimista)**: Opportunities, best case, upside estimado, probabilidade
+- **Dados Financeiros Brutos**: Snapshot completo da empresa
+
+### 2. Framework de Análise
+
+#### A. Avaliação de Consenso
+- **Analista, Bear e Bull concordam?**
+  * 3 BUY → Forte convicção, posição agressiva
+  * 2 BUY + 1 HOLD → Convicção moderada, posição normal
+  * Divergência total → Cautela, posição reduzida ou HOLD
+
+#### B. Análise de Assimetria Risco-Retorno
+- **Ratio de Sharpe Esperado** = (Upside × Prob_Bull - |Downside| × Prob_Bear) / Volatilidade_Implícita
+- **Regra**: Só entre se Expected_Return > 2× Expected_Risk
+
+#### C. Qualidade dos Argumentos
+- Qual perspectiva tem evidências mais sólidas?
+- Os números sustentam a narrativa?
+- Há red flags ignorados pelo Bull?
+- Há catalisadores ignorados pelo Bear?
+
+#### D. Contexto de Portfólio
+- Diversificação setorial
+- Correlações
+- Risco agregado
+
+### 3. Determinação da Posição (position_size)
+
+**ESTRATÉGIA DE PORTFÓLIO DIVERSIFICADO:**
+
+Para manter 85-95% sempre investido com 15-25 posições:
+
+| Score Analyst | Qualidade | Position Size Base | Ajustes |
+|---------------|-----------|-------------------|---------|
+| **85-100** | Excelente | 6-8% | +1% se Bull forte |
+| **75-84** | Muito boa | 5-7% | - |
+| **65-74** | Boa | 4-6% | -1% se Bear moderado |
+| **55-64** | Razoável (HOLD) | 2-4% | -1% se liquidez baixa |
+| **45-54** | Fraca (HOLD) | 1-3% | Apenas se necessário |
+| **<45** | Ruim | 0% | SELL |
+
+**IMPORTANTE:** 
+- Para BUY signals (65+): Position size = 4-8%
+- Para HOLD signals (45-64): Position size = 2-4%
+- Com 15-20 posições, terá 85-95% investido
+- Cash (5-15%) rende SELIC automaticamente
+
+---
+
+### 4. Stop Loss e Take Profit
+
+**Stop Loss:**
+
+Para estratégia buy-and-hold, **NÃO use stop loss**.
+
+**Justificativa:** 
+- Rebalanceamento mensal já funciona como proteção
+- Stop loss causa vendas prematuras em volatilidade temporária
+- Empresas boas (score 65+) se recuperam
+
+**Definir sempre:**
+```python
+stop_loss = None
+take_profit = None
+```
+
+### 5. Horizonte de Investimento
+
+- **short-term** (1-3 meses): Trades táticos, catalisadores iminentes
+- **medium-term** (3-12 meses): Tese fundamentalista sólida
+- **long-term** (>12 meses): Empresas estruturalmente fortes, múltiplos muito comprimidos
+
+**Critérios:**
+- Se Score > 75 E P/E < 10 → long-term
+- Se catalisador específico (earnings, evento) → short-term
+- Padrão → medium-term
+
+### 6. Synthesis (Narrativa da Decisão)
+
+Explique em 2-3 parágrafos:
+1. **O que pesou mais**: Qual análise foi determinante?
+2. **Como reconciliou divergências**: Se Bear e Bull discordam, como chegou ao meio-termo?
+3. **Fatores-chave**: Quais 3-5 fatores foram decisivos?
+
+### 7. Key Decision Factors
+
+Liste 3-5 fatores ESPECÍFICOS que determinaram a decisão:
+- "Assimetria 3:1 favorável (upside 45% vs downside 15%)"
+- "Consenso bullish entre os 3 agentes"
+- "P/E de 8x com ROE de 20% indica deep value"
+- "Bear identificou risco de liquidez que limita posição a 5%"
+
+### 8. Confidence
+
+Sua confiança na decisão (0-1):
+- 0.9-1.0: Convicção extrema, todos indicadores alinhados
+- 0.7-0.9: Alta convicção, pequenas ressalvas
+- 0.5-0.7: Moderada, alguns pontos de atenção
+- 0.3-0.5: Baixa, muita incerteza
+- <0.3: Muito baixa, melhor ficar de fora
+
+## FORMATO DE SAÍDA:
+Retorne JSON seguindo EXATAMENTE o schema SeniorDecision.
+
+## EXEMPLO:
+```json
+{
+  "ticker": "PETR4.SA",
+  "as_of": "2024-03-29",
+  "final_verdict": "buy",
+  "position_size": 7.5,
+  "stop_loss": 29.50,
+  "take_profit": 42.00,
+  "holding_period": "medium-term",
+  "synthesis": "A análise converge para uma oportunidade de compra com boa assimetria risco-retorno. O Analista identificou P/E de 4.2x com margens saudáveis (score 72.5), o Bull projetou upside de 35% com probabilidade de 70%, enquanto o Bear alertou para volatilidade do petróleo mas com downside limitado a -15% e probabilidade de apenas 40%. A assimetria 2.3:1 favorável (35% upside vs 15% downside, ponderado por probabilidades) justifica posição de 7.5%. O horizonte medium-term (6-9 meses) captura o rerating de múltiplos sem exposição excessiva a volatilidade de curto prazo.",
+  "key_decision_factors": [
+    "Assimetria risco-retorno 2.3:1 favorável (upside 35% prob 70% vs downside 15% prob 40%)",
+    "Consenso de compra entre Analista (BUY 72.5) e Bull (BUY upside 35%), com Bear moderado",
+    "Valuation extremamente comprimido: P/E 4.2x com ROE 28% indica deep value",
+    "Margens operacionais de 35% demonstram resiliência a choques de preço",
+    "Risco de volatilidade do petróleo limitado por hedge natural via exportações"
+  ],
+  "confidence": 0.82
+}
+```
+
+## REGRAS CRÍTICAS:
+- Seja RIGOROSO com position_size (máx 10%)
+- SEMPRE considere downside do Bear
+- NÃO ignore riscos para justificar position grande
+- Se incerteza alta (confidence < 0.6), reduza posição
+- JSON puro, sem markdown
+"""
+
+
+# Fecho estático do prompt de usuário.
+# IMPORTANTE: o cache automático de prompts da OpenAI só reaproveita prefixos
+# byte-idênticos — SENIOR_INSTRUCTIONS vai como primeira mensagem system (via
+# instructions=) e NUNCA deve receber conteúdo dinâmico; todo o conteúdo por
+# ticker entra apenas na mensagem de usuário.
+SENIOR_PROMPT_SUFFIX = """
+---
+
+**TAREFA:**
+Sintetize TODAS as análises acima e tome a decisão final.
+Gere o JSON seguindo o schema SeniorDecision.
+
+Considere:
+1. Consenso entre os agentes
+2. Assimetria risco-retorno (upside vs downside ponderados por probabilidades)
+3. Qualidade dos argumentos e evidências
+4. Confiança de cada agente
+5. Preço atual da ação para calcular stop_loss e take_profit
+
+Seja RIGOROSO com o position_size e REALISTA com as probabilidades.
+"""
+
+
+# ============ ORÇAMENTO DE TOKENS ============
+# O Senior concatena três JSONs + narrativas Bear/Bull; prompts muito longos
+# custam a latência inteira de um 400 do servidor antes de falhar. Contamos
+# os tokens localmente e truncamos ANTES de chamar a API. tiktoken é opcional:
+# sem ele, vale a heurística ~4 chars/token.
+try:
+    import tiktoken
+
+    _ENC = tiktoken.encoding_for_model("gpt-4o")
+
+    def _count_tokens(text: str) -> int:
+        return len(_ENC.encode(text))
+except ImportError:
+    def _count_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+_INSTR_TOKENS = _count_tokens(SENIOR_INSTRUCTIONS)
+_MAX_PROMPT_TOKENS = int(os.getenv("SENIOR_MAX_PROMPT_TOKENS", "120000"))
+
+# Chaves mantidas no snapshot quando o prompt precisa ser truncado
+_ESSENTIAL_SNAPSHOT_KEYS = (
+    "ticker", "as_of", "price", "pe", "debt_to_equity",
+    "roe", "net_margin", "current_ratio",
+)
+
+
+def _enforce_token_budget(
+    prompt: str,
+    analyst_report: FundamentalReport,
+    bear_perspective: Optional[BearPerspective],
+    bull_perspective: Optional[BullPerspective],
+) -> str:
+    """
+    Reconstrói o prompt com o snapshot reduzido às chaves essenciais se a
+    estimativa (instructions + prompt) estourar o orçamento de tokens.
+    """
+    est = _INSTR_TOKENS + _count_tokens(prompt)
+    if est <= _MAX_PROMPT_TOKENS:
+        return prompt
+
+    logger.warning(
+        "   ⚠️ Prompt de %s estimado em %d tokens (> %d); truncando snapshot",
+        analyst_report.ticker, est, _MAX_PROMPT_TOKENS,
+    )
+    slim_snapshot = {
+        k: v for k, v in analyst_report.snapshot.items()
+        if k in _ESSENTIAL_SNAPSHOT_KEYS
+    }
+    slim = analyst_report.model_copy(update={"snapshot": slim_snapshot})
+    return _build_senior_prompt(slim, bear_perspective, bull_perspective)
+
+
+# ============ AGENTE ============
+
+@functools.lru_cache(maxsize=1)
+def _senior_agent() -> Agent:
+    """
+    Singleton preguiçoso do agente Senior.
+
+    Construir o Agent (e o cliente OpenAI por trás) só na primeira chamada
+    evita pagar a inicialização do SDK quando o módulo é importado apenas
+    para type hints ou testes.
+    """
+    return Agent(
+        name="SeniorTrader",
+        model=OpenAIChat(
+            id="gpt-4o",  # Usa modelo mais potente para decisão final
+            http_client=shared_client(),
+            # JSON mode estrito: o servidor garante saída aderente ao schema,
+            # eliminando fences markdown e retries por JSON malformado
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "SeniorDecision",
+                    "schema": SeniorDecision.model_json_schema(),
+                    "strict": True,
+                },
+            },
+        ),
+        instructions=SENIOR_INSTRUCTIONS,
+    )
+
+
+# ============ CONCORRÊNCIA ============
+# Limita o número de chamadas simultâneas à API (evita estourar o RPM)
+_SEM = asyncio.Semaphore(int(os.getenv("SENIOR_CONCURRENCY", "8")))
+
+
+# ============ HELPERS ============
+
+def _build_senior_prompt(
+    analyst_report: FundamentalReport,
+    bear_perspective: Optional[BearPerspective],
+    bull_perspective: Optional[BullPerspective],
+) -> str:
+    """
+    Monta o prompt do Senior a partir de todas as análises disponíveis.
+    """
+    # Renderização memoizada: reaproveita o texto já gerado pelo Bear/Bull
+    snapshot_text = render_snapshot(
+        analyst_report.ticker,
+        str(analyst_report.as_of),
+        snapshot_bytes(analyst_report.snapshot),
+    )
+    prompt = f"""
+Você recebeu as seguintes análises para **{analyst_report.ticker}** (data: {analyst_report.as_of}):
+
+# 1. RELATÓRIO DO ANALISTA FUNDAMENTAL
+
+**Veredito:** {_VERDICT_UPPER[analyst_report.verdict]}
+**Score:** {analyst_report.score:.1f}/100 (confiança: {analyst_report.confidence:.0%})
+
+**Summary:**
+{analyst_report.summary}
+
+**Rationale:**
+{bullets(analyst_report.rationale)}
+
+**Risks:**
+{bullets(analyst_report.risks)}
+
+**Dados Brutos (Snapshot):**
+```json
+{snapshot_text}
+```
+
+"""
+
+    # Adiciona Bear se disponível
+    if bear_perspective:
+        prompt += f"""
+# 2. PERSPECTIVA BEAR (PESSIMISTA)
+
+**Recomendação:** {_VERDICT_UPPER[bear_perspective.recommended_action]}
+**Downside Estimado:** {bear_perspective.estimated_downside:.1f}%
+**Probabilidade:** {bear_perspective.downside_probability:.0%}
+**Confiança:** {bear_perspective.confidence:.0%}
+
+**Preocupações:**
+{bullets(bear_perspective.concerns)}
+
+**Pior Cenário:**
+{bear_perspective.worst_case_scenario}
+
+**Evidências do Analista Citadas:**
+{bullets(bear_perspective.evidence_from_analyst)}
+
+**Métricas-Chave Analisadas:**
+```json
+{render_snapshot(analyst_report.ticker, f"{analyst_report.as_of}:bear_metrics", snapshot_bytes(bear_perspective.key_metrics_analyzed))}
+```
+
+"""
+    else:
+        prompt += """
+# 2. PERSPECTIVA BEAR (PESSIMISTA)
+
+⚠️ **Análise Bear não disponível** (falha no agente)
+Prossiga com cautela extra e assuma downside conservador de -20%.
+
+"""
+
+    # Adiciona Bull se disponível
+    if bull_perspective:
+        prompt += f"""
+# 3. PERSPECTIVA BULL (OTIMISTA)
+
+**Recomendação:** {_VERDICT_UPPER[bull_perspective.recommended_action]}
+**Upside Estimado:** +{bull_perspective.estimated_upside:.1f}%
+**Probabilidade:** {bull_perspective.upside_probability:.0%}
+**Confiança:** {bull_perspective.confidence:.0%}
+
+**Oportunidades:**
+{bullets(bull_perspective.opportunities)}
+
+**Melhor Cenário:**
+{bull_perspective.best_case_scenario}
+
+**Evidências do Analista Citadas:**
+{bullets(bull_perspective.evidence_from_analyst)}
+
+**Métricas-Chave Analisadas:**
+```json
+{render_snapshot(analyst_report.ticker, f"{analyst_report.as_of}:bull_metrics", snapshot_bytes(bull_perspective.key_metrics_analyzed))}
+```
+
+"""
+    else:
+        prompt += """
+# 3. PERSPECTIVA BULL (OTIMISTA)
+
+⚠️ **Análise Bull não disponível** (falha no agente)
+Prossiga com cautela extra e assuma upside conservador de +15%.
+
+"""
+
+    prompt += SENIOR_PROMPT_SUFFIX
+
+    return prompt
+
+
+def _parse_senior(content: str) -> SeniorDecision:
+    """
+    Extrai e valida o JSON de uma resposta do agente Senior.
+    Compartilhado entre os caminhos síncrono e assíncrono.
+    """
+    # JSON mode garante saída parseável direto, sem fence markdown
+    senior_dict = _json_loads(content)
+
+    # Valida com Pydantic (model_validate evita a expansão de kwargs)
+    return SeniorDecision.model_validate(senior_dict)
+
+
+@llm_retry
+async def _acall_llm(prompt: str):
+    """Chamada assíncrona com retry transitório (429/timeout/conexão)."""
+    return await _senior_agent().arun(prompt)
+
+
+@llm_retry
+def _run_senior_streaming(prompt: str) -> SeniorDecision:
+    """
+    Consome a resposta do LLM em streaming e tenta o parse assim que as
+    chaves do JSON se equilibram — a validação começa no instante em que o
+    fecha-chaves final chega, em vez de esperar o fim do stream.
+    """
+    parts: List[str] = []
+    opens = closes = 0
+
+    for event in _senior_agent().run(prompt, stream=True):
+        chunk = getattr(event, "content", None) or ""
+        if not chunk:
+            continue
+        parts.append(chunk)
+        opens += chunk.count("{")
+        closes += chunk.count("}")
+
+        # Parse antecipado quando o JSON parece completo
+        if opens and opens == closes:
+            try:
+                return _parse_senior("".join(parts))
+            except Exception:
+                pass  # fence ainda aberto ou JSON incompleto; segue consumindo
+
+    content = "".join(parts)
+    try:
+        return _parse_senior(content)
+    except Exception as e:
+        raise ValueError(
+            f"Falha ao parsear resposta do agente Senior: {e}\n"
+            f"Resposta bruta: {content[:500]}"
+        )
+
+
+# ============ ORCHESTRATOR ============
+
+def run_senior(
+    analyst_report: FundamentalReport,
+    bear_perspective: Optional[BearPerspective],
+    bull_perspective: Optional[BullPerspective],
+    verbose: bool = True
+) -> SeniorDecision:
+    """
+    Executa decisão final do Senior baseada em todas as análises.
+
+    Args:
+        analyst_report: Relatório do analista fundamental
+        bear_perspective: Análise do Bear (pode ser None se falhou)
+        bull_perspective: Análise do Bull (pode ser None se falhou)
+        verbose: Se True, imprime progresso
+
+    Returns:
+        SeniorDecision com decisão final
+    """
+
+    logger.log(_lvl(verbose), "\n👔 Decisão do Senior para %s...", analyst_report.ticker)
+
+    # Prepara contexto completo
+    prompt = _build_senior_prompt(analyst_report, bear_perspective, bull_perspective)
+    prompt = _enforce_token_budget(prompt, analyst_report, bear_perspective, bull_perspective)
+
+    logger.log(_lvl(verbose), "   Sintetizando todas as perspectivas...")
+
+    # Streaming: sobrepõe o parse à latência da rede
+    try:
+        senior_decision = _run_senior_streaming(prompt)
+    except Exception as e:
+        logger.log(_lvl(verbose), "   ❌ Erro ao parsear resposta: %s", e)
+        raise
+
+    lvl = _lvl(verbose)
+    logger.log(lvl, "   ✅ Decisão tomada: %s", _VERDICT_UPPER[senior_decision.final_verdict])
+    logger.log(lvl, "      Position Size: %.1f%%", senior_decision.position_size)
+    logger.log(lvl, "      Stop Loss: %s", senior_decision.stop_loss if senior_decision.stop_loss else "N/A")
+    logger.log(lvl, "      Take Profit: %s", senior_decision.take_profit if senior_decision.take_profit else "N/A")
+    logger.log(lvl, "      Holding Period: %s", senior_decision.holding_period)
+    logger.log(lvl, "      Confiança: %.0f%%", senior_decision.confidence * 100)
+
+    return senior_decision
+
+
+async def run_senior_async(
+    analyst_report: FundamentalReport,
+    bear_perspective: Optional[BearPerspective],
+    bull_perspective: Optional[BullPerspective],
+    verbose: bool = False
+) -> SeniorDecision:
+    """
+    Versão assíncrona de run_senior.
+    A chamada à API roda sob semáforo para limitar a concorrência.
+    """
+    prompt = _build_senior_prompt(analyst_report, bear_perspective, bull_perspective)
+    prompt = _enforce_token_budget(prompt, analyst_report, bear_perspective, bull_perspective)
+
+    async with _SEM:
+        # Respeita as cotas de RPM/TPM antes de enviar
+        await acquire_llm_slot(prompt)
+        response = await _acall_llm(prompt)
+
+    try:
+        senior_decision = _parse_senior(str(response.content))
+
+        logger.log(_lvl(verbose), "   👔 %s: %s (position: %.1f%%)",
+                   analyst_report.ticker,
+                   _VERDICT_UPPER[senior_decision.final_verdict],
+                   senior_decision.position_size)
+
+        return senior_decision
+
+    except Exception as e:
+        raise ValueError(
+            f"Falha ao parsear resposta do agente Senior: {e}\n"
+            f"Resposta bruta: {str(response.content)[:500]}"
+        )
+
+
+async def run_senior_batch(
+    inputs: List[Tuple[FundamentalReport, Optional[BearPerspective], Optional[BullPerspective]]],
+    verbose: bool = False
+) -> List[SeniorDecision]:
+    """
+    Executa a decisão do Senior para vários tickers em paralelo.
+
+    As chamadas são disparadas com asyncio.gather; o semáforo SENIOR_CONCURRENCY
+    (padrão: 8) limita quantas ficam em voo ao mesmo tempo.
+
+    Args:
+        inputs: Lista de tuplas (analyst_report, bear_perspective, bull_perspective)
+        verbose: Se True, imprime progresso por ticker
+
+    Returns:
+        Lista de SeniorDecision na mesma ordem dos inputs
+    """
+    logger.log(_lvl(verbose), "\n👔 Decidindo %d tickers em paralelo...", len(inputs))
+
+    tasks = [
+        run_senior_async(report, bear, bull, verbose=verbose)
+        for report, bear, bull in inputs
+    ]
+    return list(await asyncio.gather(*tasks))
+
+
+# ============ TESTE STANDALONE ============
+
+if __name__ == "__main__":
+    print("⚠️ Este agente precisa de FundamentalReport + BearPerspective + BullPerspective.")
+
+    print("   Execute via orchestrator.py completo.")
@@ -460,13 +460,23 @@ class BacktestEngine:
         if self.verbose:
             print(f"\n📅 {len(rebalance_dates)} datas de rebalanceamento")
         
+        # Caminho rápido de preços: matriz NumPy + mapeamento de colunas
+        # construídos uma vez; cada barra vira um gather vetorizado
+        # ascontiguousarray: DataFrames costumam sair em ordem Fortran, e aí
+        # cada slice de linha pularia pela memória sem localidade de cache
+        price_matrix = np.ascontiguousarray(self.price_data.to_numpy(dtype=np.float64))
+        assert price_matrix.flags['C_CONTIGUOUS']
+        self.portfolio.preallocate_history(len(self.price_data))
+        self.portfolio.set_price_columns(
+            {ticker: j for j, ticker in enumerate(self.price_data.columns)}
+        )
+
         # 3. Loop principal
-        for date in self.price_data.index:
+        for bar_i, date in enumerate(self.price_data.index):
             date_str = date.strftime('%Y-%m-%d')
-            
+
             # Atualiza preços
-            current_prices = self.price_data.loc[date].to_dict()
-            self.portfolio.update_prices(current_prices)
+            self.portfolio.update_prices_vec(price_matrix[bar_i])
             
             # Aplica SELIC diariamente ao cash
             self.portfolio.apply_selic_to_cash(date_str, 0.00035)
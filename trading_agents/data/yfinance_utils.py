@@ -2,28 +2,248 @@
 Utilitários para coleta de dados via yfinance.
 """
 
+import functools
+import os
+import pickle
+from math import isfinite
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
 import yfinance as yf
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+# numba é opcional: sem ele, o kernel vetorizado roda em Python puro
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+# Cache em disco dos dados do Yahoo: fundamentos mudam por trimestre, mas
+# backtests re-pedem o mesmo (ticker, data) dezenas de vezes
+_CACHE_DIR = os.path.expanduser("~/.sp3ctron_cache")
+
+# Campo do snapshot -> chaves do .info (em ordem de preferência).
+# Uma comprehension sobre este mapa substitui a cadeia de ~15 chamadas
+# safe_float(info.get(...)) por ticker.
+_INFO_FIELDS = {
+    'price': ('currentPrice', 'regularMarketPrice'),
+    'market_cap': ('marketCap',),
+    'shares_out': ('sharesOutstanding',),
+    'pe': ('trailingPE', 'forwardPE'),
+    'pb': ('priceToBook',),
+    'ps': ('priceToSalesTrailing12Months',),
+    'gross_margin': ('grossMargins',),
+    'op_margin': ('operatingMargins',),
+    'net_margin': ('profitMargins',),
+    'roe': ('returnOnEquity',),
+    'roa': ('returnOnAssets',),
+    'revenue_growth_yoy': ('revenueGrowth',),
+    'net_income_growth_yoy': ('earningsGrowth',),
+    'total_debt': ('totalDebt',),
+    'total_equity': ('totalStockholderEquity',),
+    'current_ratio': ('currentRatio',),
+    'dividend_yield': ('dividendYield',),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _yf_session() -> requests.Session:
+    """
+    Session HTTP única para todas as chamadas yfinance.
+
+    Mantém as conexões TCP/TLS com os servidores do Yahoo no pool em vez
+    de renegociar handshake a cada Ticker.
+    """
+    return requests.Session()
+
+
+def _quarter_key(as_of: str) -> int:
+    """Chave de trimestre (ano*4 + trimestre) para o cache de fundamentos."""
+    dt = datetime.strptime(as_of, "%Y-%m-%d")
+    return dt.year * 4 + (dt.month - 1) // 3
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_fetch(ticker: str, kind: str, quarter_key: int) -> Dict[str, Any]:
+    """
+    Busca dados do Yahoo com cache em dois níveis (memória + disco).
+
+    lru_cache elimina re-fetches no mesmo processo; o pickle em
+    ~/.sp3ctron_cache sobrevive entre execuções, chaveado por trimestre
+    (a granularidade em que fundamentos efetivamente mudam).
+
+    Args:
+        ticker: Ticker da ação
+        kind: Tipo de dado ('info')
+        quarter_key: Chave de trimestre de _quarter_key()
+
+    Returns:
+        Dict com os dados (vazio se indisponível)
+    """
+    path = os.path.join(_CACHE_DIR, f"{ticker}_{kind}_{quarter_key}.pkl")
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    data = yf.Ticker(ticker, session=_yf_session()).info or {}
+
+    if data:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(data, f)
+
+    return data
+
 
 def safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
     """
     Converte para float de forma segura.
     Trata None, '', 'None', NaN, Infinity.
     """
-    if value is None or value == 'None' or value == '':
+    if value is None or value in ('', 'None'):
         return default
     try:
         result = float(value)
-        # Verifica NaN ou Infinity
-        if not (result == result and abs(result) != float('inf')):
+        # Verifica NaN ou Infinity (checagem única em C)
+        if not isfinite(result):
             return default
         return result
     except (ValueError, TypeError):
         return default
 
 
+def safe_div(numerator: Any, denominator: Any) -> Optional[float]:
+    """
+    Divisão segura: None se numerador/denominador ausente ou divisor zero.
+    """
+    if numerator is None or denominator is None:
+        return None
+    try:
+        if denominator == 0:
+            return None
+        return float(numerator) / float(denominator)
+    except (ValueError, TypeError):
+        return None
+
+
+@njit(fastmath=True, cache=True, parallel=True)
+def safe_div_vec(num: np.ndarray, den: np.ndarray, out: np.ndarray):
+    """
+    Versão vetorizada de safe_div para lotes de snapshots.
+
+    Divisor zero vira NaN (o equivalente array do None escalar); o loop
+    compilado com prange roda perto da banda de memória em vez de um
+    despacho Python por razão.
+
+    Args:
+        num: Numeradores float64
+        den: Denominadores float64
+        out: Array de saída pré-alocado (mesmo tamanho)
+    """
+    for i in prange(num.shape[0]):
+        out[i] = num[i] / den[i] if den[i] != 0.0 else np.nan
+
+
+def last_before_or_equal(df: Optional[pd.DataFrame], as_of_dt: datetime) -> Optional[pd.DataFrame]:
+    """
+    Filtra colunas (períodos) de um statement até a data de referência.
+
+    Evita look-ahead: só períodos fechados em ou antes de as_of_dt
+    sobrevivem, ordenados do mais recente para o mais antigo.
+
+    Args:
+        df: Statement do yfinance (colunas = datas de fechamento)
+        as_of_dt: Data de referência
+
+    Returns:
+        DataFrame filtrado ou None se não sobrar período
+    """
+    if df is None or df.empty:
+        return None
+
+    cutoff = pd.Timestamp(as_of_dt)
+    cols = sorted(
+        (c for c in df.columns if pd.Timestamp(c) <= cutoff),
+        reverse=True
+    )
+
+    if not cols:
+        return None
+
+    return df[cols]
+
+
+def last_val(df: Optional[pd.DataFrame], row_label: str) -> Optional[float]:
+    """
+    Valor do período mais recente de uma linha do statement.
+
+    Args:
+        df: Statement já filtrado por last_before_or_equal
+        row_label: Nome da linha (ex: 'Total Revenue')
+
+    Returns:
+        Valor float ou None se ausente
+    """
+    if df is None or row_label not in df.index:
+        return None
+    return safe_float(df.loc[row_label].iloc[0])
+
+
+def calculate_yoy_growth(df: Optional[pd.DataFrame], row_label: str) -> Optional[float]:
+    """
+    Crescimento YoY de uma linha do statement (período atual vs anterior).
+
+    Args:
+        df: Statement já filtrado por last_before_or_equal
+        row_label: Nome da linha (ex: 'Total Revenue')
+
+    Returns:
+        Crescimento em decimal (0.15 = +15%) ou None se faltar período
+    """
+    if df is None or row_label not in df.index or df.shape[1] < 2:
+        return None
+
+    row = df.loc[row_label]
+    current = safe_float(row.iloc[0])
+    previous = safe_float(row.iloc[1])
+
+    if current is None or previous is None or previous == 0:
+        return None
+
+    return (current - previous) / abs(previous)
+
+
+# Campos mínimos para um snapshot utilizável vs. desejáveis para score cheio
+_CRITICAL_FIELDS = ('price', 'market_cap')
+_DESIRABLE_FIELDS = ('pe', 'pb', 'ps', 'gross_margin', 'net_margin', 'roe', 'debt_to_equity')
+
+
+def validate_snapshot(snapshot: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]:
+    """
+    Valida completude de um snapshot fundamentalista.
+
+    Args:
+        snapshot: Dict do get_fundamental_snapshot
+
+    Returns:
+        (é_válido, campos_críticos_faltando, campos_desejáveis_faltando)
+    """
+    missing_critical = [f for f in _CRITICAL_FIELDS if snapshot.get(f) is None]
+    missing_desirable = [f for f in _DESIRABLE_FIELDS if snapshot.get(f) is None]
+    return not missing_critical, missing_critical, missing_desirable
+
+
 def get_fundamental_snapshot(ticker: str, as_of: Optional[str] = None) -> Dict[str, Any]:
     """
     Coleta snapshot de dados fundamentalistas de um ticker.
@@ -40,98 +260,52 @@ def get_fundamental_snapshot(ticker: str, as_of: Optional[str] = None) -> Dict[s
         as_of = datetime.now().strftime("%Y-%m-%d")
     
     try:
-        tk = yf.Ticker(ticker)
-        info = tk.info or {}
+        info = _cached_fetch(ticker, 'info', _quarter_key(as_of))
         
         # ============ COLETA COM TRATAMENTO ============
-        
-        # Preço
-        price = safe_float(info.get('currentPrice') or info.get('regularMarketPrice'))
-        
-        # Market Cap
-        market_cap = safe_float(info.get('marketCap'))
-        
-        # Shares Outstanding
-        shares = safe_float(info.get('sharesOutstanding'))
-        
-        # Múltiplos de Valuation
-        pe = safe_float(info.get('trailingPE') or info.get('forwardPE'))
-        pb = safe_float(info.get('priceToBook'))
-        ps = safe_float(info.get('priceToSalesTrailing12Months'))
-        
-        # Margens
-        gross_margin = safe_float(info.get('grossMargins'))
-        op_margin = safe_float(info.get('operatingMargins'))
-        net_margin = safe_float(info.get('profitMargins'))
-        
-        # Retornos
-        roe = safe_float(info.get('returnOnEquity'))
-        roa = safe_float(info.get('returnOnAssets'))
-        
-        # Crescimento
-        revenue_growth = safe_float(info.get('revenueGrowth'))
-        earnings_growth = safe_float(info.get('earningsGrowth'))
-        
-        # Dívida e Liquidez
-        total_debt = safe_float(info.get('totalDebt'))
-        total_equity = safe_float(info.get('totalStockholderEquity'))
-        
-        # Debt to Equity
+        # Uma passada sobre o mapa de campos, respeitando a ordem de
+        # preferência das chaves do .info
+        snap = {
+            key: safe_float(next((info.get(f) for f in fields if info.get(f) is not None), None))
+            for key, fields in _INFO_FIELDS.items()
+        }
+
+        # Debt to Equity (derivado)
+        total_debt = snap['total_debt']
+        total_equity = snap['total_equity']
         if total_debt and total_equity and total_equity > 0:
             debt_to_equity = total_debt / total_equity
         else:
             debt_to_equity = None
-        
-        # Current Ratio
-        current_ratio = safe_float(info.get('currentRatio'))
-        
-        # Dividend Yield
-        dividend_yield = safe_float(info.get('dividendYield'))
-        
+
         # ============ EVIDÊNCIAS ============
         evidence = []
-        
-        if price:
-            evidence.append(f"Preço atual: R$ {price:.2f}")
-        if market_cap:
-            evidence.append(f"Market Cap: R$ {market_cap/1e9:.2f}B")
-        if pe:
-            evidence.append(f"P/E: {pe:.2f}")
-        if net_margin:
-            evidence.append(f"Margem Líquida: {net_margin*100:.1f}%")
-        if roe:
-            evidence.append(f"ROE: {roe*100:.1f}%")
+
+        if snap['price']:
+            evidence.append(f"Preço atual: R$ {snap['price']:.2f}")
+        if snap['market_cap']:
+            evidence.append(f"Market Cap: R$ {snap['market_cap']/1e9:.2f}B")
+        if snap['pe']:
+            evidence.append(f"P/E: {snap['pe']:.2f}")
+        if snap['net_margin']:
+            evidence.append(f"Margem Líquida: {snap['net_margin']*100:.1f}%")
+        if snap['roe']:
+            evidence.append(f"ROE: {snap['roe']*100:.1f}%")
         if debt_to_equity:
             evidence.append(f"D/E: {debt_to_equity:.2f}")
-        
+
         if not evidence:
             evidence.append("Dados fundamentalistas limitados para esta empresa")
-        
+
         # ============ SNAPSHOT ============
         snapshot = {
             'ticker': ticker,
             'as_of': as_of,
-            'price': price,
-            'market_cap': market_cap,
-            'shares_out': shares,
-            'pe': pe,
-            'pb': pb,
-            'ps': ps,
-            'gross_margin': gross_margin,
-            'op_margin': op_margin,
-            'net_margin': net_margin,
-            'roe': roe,
-            'roa': roa,
-            'revenue_growth_yoy': revenue_growth,
-            'net_income_growth_yoy': earnings_growth,
-            'total_debt': total_debt,
-            'total_equity': total_equity,
+            **snap,
             'debt_to_equity': debt_to_equity,
-            'current_ratio': current_ratio,
-            'dividend_yield': dividend_yield,
             'evidence': evidence
         }
-        
+
         return snapshot
         
     except Exception as e:
@@ -161,6 +335,54 @@ def get_fundamental_snapshot(ticker: str, as_of: Optional[str] = None) -> Dict[s
         }
 
 
+def get_fundamental_snapshot_fast(ticker: str, as_of: Optional[str] = None):
+    """
+    Snapshot como dataclass com slots, para o caminho quente interno.
+
+    Sem __dict__ por instância nem validação Pydantic; converter para o
+    modelo Pydantic só na fronteira LLM/API via .to_pydantic().
+
+    Args:
+        ticker: Ticker da ação (ex: PETR4.SA)
+        as_of: Data de referência YYYY-MM-DD (None = hoje)
+
+    Returns:
+        FundamentalSnapshotFast
+    """
+    from models.schemas import FundamentalSnapshotFast
+
+    return FundamentalSnapshotFast(**get_fundamental_snapshot(ticker, as_of))
+
+
+def get_fundamental_snapshots_batch(
+    tickers: List[str],
+    as_of: Optional[str] = None,
+    max_workers: int = 16
+) -> List[Dict[str, Any]]:
+    """
+    Coleta snapshots fundamentalistas de vários tickers em paralelo.
+
+    Cada snapshot é dominado por round-trips HTTPS bloqueantes ao Yahoo;
+    um pool de threads sobrepõe a espera de rede e a Session compartilhada
+    reaproveita as conexões.
+
+    Args:
+        tickers: Lista de tickers (ex: ['PETR4.SA', 'VALE3.SA'])
+        as_of: Data de referência YYYY-MM-DD (None = hoje)
+        max_workers: Número de threads do pool
+
+    Returns:
+        Lista de snapshots na mesma ordem dos tickers
+    """
+    if not tickers:
+        return []
+
+    fetch = functools.partial(get_fundamental_snapshot, as_of=as_of)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        return list(executor.map(fetch, tickers))
+
+
 # Alias para compatibilidade com código antigo
 get_snapshot = get_fundamental_snapshot
 
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import  Optional, List, Dict, Any
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from datetime import datetime
 
@@ -45,6 +46,52 @@ class FundamentalSnapshot(BaseModel):
     evidence: List[str] = Field(default_factory=list)
 
 
+@dataclass(slots=True)
+class FundamentalSnapshotFast:
+    """
+    Versão dataclass do FundamentalSnapshot para o caminho quente interno.
+
+    slots=True dispensa o __dict__ por instância e o construtor não passa
+    pelo validador do pydantic-core; o modelo Pydantic fica só na fronteira
+    LLM/API (via to_pydantic).
+    """
+    ticker: str
+    as_of: str
+    price: Optional[float] = None
+    market_cap: Optional[float] = None
+    shares_out: Optional[float] = None
+
+    # Valuation
+    pe: Optional[float] = None
+    pb: Optional[float] = None
+    ps: Optional[float] = None
+
+    # Qualidade/Lucratividade
+    gross_margin: Optional[float] = None
+    op_margin: Optional[float] = None
+    net_margin: Optional[float] = None
+    roe: Optional[float] = None
+    roa: Optional[float] = None
+
+    # Crescimento
+    revenue_growth_yoy: Optional[float] = None
+    net_income_growth_yoy: Optional[float] = None
+
+    # Risco/Alavancagem
+    total_debt: Optional[float] = None
+    total_equity: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    current_ratio: Optional[float] = None
+    dividend_yield: Optional[float] = None
+
+    # Metadados
+    evidence: List[str] = field(default_factory=list)
+
+    def to_pydantic(self) -> "FundamentalSnapshot":
+        """Valida e converte para o modelo Pydantic na fronteira LLM/API."""
+        return FundamentalSnapshot.model_validate(asdict(self))
+
+
 class FundamentalReport(BaseModel):
     """Output do Agente Analista"""
     ticker: str
@@ -187,6 +234,10 @@ class TradingState(BaseModel):
     as_of: str
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     
+    # Snapshot fundamentalista coletado uma única vez no Step 1 e
+    # compartilhado por referência com todos os agentes (sem re-fetch)
+    snapshot: Optional[Dict[str, Any]] = None
+
     # Outputs dos agentes (preenchidos sequencialmente)
     analyst_report: Optional[FundamentalReport] = None
     bear_perspective: Optional[BearPerspective] = None
@@ -204,7 +255,8 @@ class TradingState(BaseModel):
         description="initialized | analyst_done | specialists_done | senior_done | completed | failed"
     )
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    # Pydantic v2: Config/json_encoders legados viravam warning a cada
+    # construção; datas já circulam como str isoformat, então basta o
+    # ConfigDict. validate_assignment fica em False (default) porque o
+    # pipeline escreve os outputs dos agentes campo a campo.
+    model_config = ConfigDict(extra='ignore')
\ No newline at end of file
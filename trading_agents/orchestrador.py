@@ -5,58 +5,216 @@ Gerencia o fluxo: Analyst → Bear + Bull → Senior → Decisão Final
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# __file__ já é absoluto na importação; o guard evita re-inserir (e os
+# stats de abspath) quando o módulo é importado mais de uma vez
+_p = os.path.dirname(__file__)
+if _p not in sys.path:
+    sys.path.insert(0, _p)
 
+import asyncio
+import functools
+import io
+import json
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait,
+)
+from datetime import date
 from typing import Optional
 
 from models.schemas import TradingState
-from agents.analyst import run_analyst
-from agents.bear import run_bear
-from agents.bull import run_bull
-from agents.senior import run_senior 
+
+# Imports dos agentes são lazy: cada um puxa o SDK de LLM (agno) por
+# transitividade, e quem só importa o orchestrador — backtest, batch
+# driver re-spawnando subprocessos — não deve pagar esse cold start
+run_analyst = None
+run_bear = None
+run_bull = None
+run_senior = None
+
+
+def _lazy_import_agents() -> None:
+    """Importa os módulos dos agentes na 1ª execução e memoiza nos globals."""
+    global run_analyst, run_bear, run_bull, run_senior
+    if run_analyst is None:
+        import importlib
+        run_analyst = importlib.import_module("agents.analyst").run_analyst
+        run_bear = importlib.import_module("agents.bear").run_bear
+        run_bull = importlib.import_module("agents.bull").run_bull
+        run_senior = importlib.import_module("agents.senior").run_senior
+
+# ============ TIMEOUTS POR AGENTE ============
+# Um agente pendurado (LLM sem resposta) não pode travar o pipeline
+# inteiro: cada chamada tem teto de latência e vira fast-fail no p99
+ANALYST_TIMEOUT_S: int = 60
+SPECIALIST_TIMEOUT_S: int = 45
+SENIOR_TIMEOUT_S: int = 45
+
+# ============ CACHE DO PIPELINE ============
+# Estado final persistido em disco: re-invocações (CI, dashboard dando
+# refresh) do mesmo (ticker, as_of, min_confidence) voltam em milissegundos
+# em vez de repagar yfinance + três agentes de LLM. diskcache é opcional;
+# sem ele, cai num pickle por arquivo com a mesma validade. Só estados
+# "completed" entram no cache; SP3CTRON_NOCACHE=1 desliga a leitura.
+_PIPELINE_CACHE_DIR: str = os.path.expanduser("~/.sp3ctron_cache")
+_PIPELINE_CACHE_TTL_S: int = 86400  # 24h
+
+try:
+    from diskcache import Cache
+
+    _pipeline_cache = Cache(_PIPELINE_CACHE_DIR)
+
+    def _pipeline_cache_get(key: str) -> Optional[TradingState]:
+        return _pipeline_cache.get(key)
+
+    def _pipeline_cache_set(key: str, value: TradingState) -> None:
+        _pipeline_cache.set(key, value, expire=_PIPELINE_CACHE_TTL_S)
+except ImportError:
+    import pickle as _pickle
+
+    def _pipeline_cache_get(key: str) -> Optional[TradingState]:
+        path = os.path.join(_PIPELINE_CACHE_DIR, key.replace("/", "-") + ".pkl")
+        try:
+            if time.time() - os.path.getmtime(path) > _PIPELINE_CACHE_TTL_S:
+                return None
+            with open(path, "rb") as f:
+                return _pickle.load(f)
+        except (OSError, _pickle.UnpicklingError, EOFError):
+            return None
+
+    def _pipeline_cache_set(key: str, value: TradingState) -> None:
+        os.makedirs(_PIPELINE_CACHE_DIR, exist_ok=True)
+        path = os.path.join(_PIPELINE_CACHE_DIR, key.replace("/", "-") + ".pkl")
+        with open(path, "wb") as f:
+            _pickle.dump(value, f)
+
+
+class _StepLog:
+    """
+    Buffer de saída do modo verbose.
+
+    Cada print é um write(2) síncrono no stdout; acumular as linhas de um
+    bloco e despejar tudo num único sys.stdout.write reduz para ~1 syscall
+    por step — diferença que compõe quando o pipeline roda em loop sobre
+    milhares de tickers com stdout redirecionado.
+    """
+    __slots__ = ("_enabled", "_buf")
+
+    def __init__(self, enabled: bool) -> None:
+        self._enabled = enabled
+        self._buf = io.StringIO() if enabled else None
+
+    def line(self, text: str = "") -> None:
+        if self._enabled:
+            self._buf.write(text + "\n")
+
+    def flush(self) -> None:
+        if self._enabled and self._buf.tell():
+            sys.stdout.write(self._buf.getvalue())
+            self._buf.truncate(0)
+            self._buf.seek(0)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_analyst(ticker: str, as_of: str) -> dict:
+    """
+    run_analyst memoizado por (ticker, as_of).
+
+    Re-execuções do CLI e batches repetem o mesmo par com frequência; o
+    hit de cache troca segundos de yfinance + LLM por um lookup de dict.
+    Como as_of é sempre YYYY-MM-DD, a entrada de ontem não vaza para hoje.
+    """
+    return run_analyst(ticker, as_of)
 
 
 def run_trading_pipeline(
     ticker: str,
     as_of: Optional[str] = None,
     min_confidence: float = 0.7,
+    hard_min_confidence: Optional[float] = None,
+    enable_streaming_senior: bool = False,
     verbose: bool = True
 ) -> TradingState:
     """
     Executa o pipeline completo de análise multi-agente.
-    
+
+    Bear e Bull não dependem um do outro (ambos leem só o relatório do
+    analista) e são limitados por I/O de LLM; o Step 2 despacha os dois
+    num ThreadPoolExecutor — as threads soltam o GIL durante o socket, a
+    latência vira a do mais lento, não a soma.
+
     Args:
         ticker: Símbolo da ação (ex: PETR4.SA)
         as_of: Data de referência YYYY-MM-DD (None = hoje)
         min_confidence: Confiança mínima para prosseguir (0-1)
+        hard_min_confidence: Piso abaixo do qual os especialistas nem são
+            chamados (None = min_confidence/2); economiza 3 round-trips
+            de LLM em tickers com dados finos
+        enable_streaming_senior: Fan-in especulativo — dispara o Senior
+            assim que o 1º especialista termina e só re-roda se o 2º
+            discordar do veredito antecipado; gasta um round-trip extra
+            de LLM quando há divergência, por isso default False
         verbose: Se True, imprime progresso
-    
+
     Returns:
         TradingState com todos os outputs dos agentes
     """
-    
-    start_time = time.time()
+
+    # perf_counter: monotônico (imune a saltos de NTP) e mais barato que
+    # time.time() no Linux (vDSO)
+    start_time = time.perf_counter()
     
     # Inicializa estado
+    _lazy_import_agents()
+
+    # date.today().isoformat() é caminho C puro e só roda quando precisa
+    if as_of is None:
+        as_of = date.today().isoformat()
+
     state = TradingState(
         ticker=ticker,
-        as_of=as_of or time.strftime("%Y-%m-%d"),
+        as_of=as_of,
         pipeline_status="initialized"
     )
-    
+
+    cache_key: str = f"pipeline_v1:{ticker}:{state.as_of}:{round(min_confidence, 3)}"
+    if not os.environ.get("SP3CTRON_NOCACHE"):
+        cached_state = _pipeline_cache_get(cache_key)
+        if cached_state is not None:
+            if verbose:
+                print(f"💾 Pipeline cache hit: {ticker} @ {state.as_of}")
+            return cached_state
+
+    log = _StepLog(verbose)
+
     if verbose:
-        print("\n" + "="*70)
-        print(f"🚀 INICIANDO PIPELINE MULTI-AGENTE: {ticker}")
-        print("="*70)
-    
+        log.line("\n" + "="*70)
+        log.line(f"🚀 INICIANDO PIPELINE MULTI-AGENTE: {ticker}")
+        log.line("="*70)
+
     try:
         # ============ STEP 1: ANALISTA FUNDAMENTAL ============
         if verbose:
-            print(f"\n[STEP 1/3] 📊 Analista Fundamental")
-            print("-" * 70)
-        
-        analyst_result = run_analyst(ticker, as_of)
+            log.line(f"\n[STEP 1/3] 📊 Analista Fundamental")
+            log.line("-" * 70)
+            log.flush()
+
+        # shutdown(wait=False): um `with` esperaria a thread pendurada no
+        # __exit__ e anularia o teto de latência
+        ex = ThreadPoolExecutor(max_workers=1)
+        fut_analyst = ex.submit(_cached_analyst, ticker, state.as_of)
+        try:
+            analyst_result = fut_analyst.result(timeout=ANALYST_TIMEOUT_S)
+        except FutureTimeoutError:
+            fut_analyst.cancel()
+            state.errors.append(f"Analista estourou timeout ({ANALYST_TIMEOUT_S}s)")
+            state.pipeline_status = "timeout"
+            return state
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
         
         if analyst_result["status"] != "success":
             state.errors.append(f"Analista falhou: {analyst_result.get('message')}")
@@ -68,42 +226,101 @@ def run_trading_pipeline(
             warning = f"Confiança baixa do analista ({analyst_result['confidence']:.0%})"
             state.warnings.append(warning)
             if verbose:
-                print(f"   ⚠️ {warning}")
-        
+                log.line(f"   ⚠️ {warning}")
+
         state.analyst_report = analyst_result["report"]
+        # Snapshot coletado uma vez, compartilhado por referência com o
+        # resto do pipeline (os agentes leem via analyst_report.snapshot)
+        state.snapshot = analyst_result.get("snapshot")
         state.pipeline_status = "analyst_done"
-        
+
+        # Piso duro: sinal tão fraco que Bear/Bull/Senior não mudariam a
+        # conclusão — sai antes de pagar 3 round-trips de LLM
+        hard_floor: float = hard_min_confidence if hard_min_confidence is not None else min_confidence * 0.5
+        if analyst_result.get("confidence", 0) < hard_floor:
+            warning = (f"Confiança muito baixa ({analyst_result.get('confidence', 0):.0%} "
+                       f"< piso {hard_floor:.0%}) — pulando especialistas")
+            state.warnings.append(warning)
+            state.pipeline_status = "skipped_low_confidence"
+            if verbose:
+                log.line(f"   ⏭️ {warning}")
+            return state
+
         if verbose:
-            print(f"\n   ✅ Análise do Analista completa")
-            print(f"      Veredito: {state.analyst_report.verdict.value.upper()}")
-            print(f"      Score: {state.analyst_report.score:.1f}/100")
-            print(f"      Confiança: {state.analyst_report.confidence:.0%}")
-        
+            log.line(f"\n   ✅ Análise do Analista completa")
+            log.line(f"      Veredito: {state.analyst_report.verdict.value.upper()}")
+            log.line(f"      Score: {state.analyst_report.score:.1f}/100")
+            log.line(f"      Confiança: {state.analyst_report.confidence:.0%}")
+
         # ============ STEP 2: ESPECIALISTAS (BEAR + BULL) ============
         if verbose:
-            print(f"\n[STEP 2/3] 🐻🐂 Especialistas Debatendo")
-            print("-" * 70)
-        
-        # Bear (Pessimista)
-        try:
-            bear_perspective = run_bear(state.analyst_report, verbose=verbose)
-            state.bear_perspective = bear_perspective
-        except Exception as e:
-            error_msg = f"Agente Bear falhou: {e}"
-            state.errors.append(error_msg)
-            if verbose:
-                print(f"   ❌ {error_msg}")
-        
-        # Bull (Otimista)
+            log.line(f"\n[STEP 2/3] 🐻🐂 Especialistas Debatendo")
+            log.line("-" * 70)
+            log.flush()
+
+        # Bear (Pessimista) + Bull (Otimista) em paralelo. Loop dirigido a
+        # dados: acrescentar um terceiro especialista (Neutro/Macro) é uma
+        # linha na tupla
+        specialists = (
+            ("Bear", run_bear, "bear_perspective"),
+            ("Bull", run_bull, "bull_perspective"),
+        )
+
+        early_senior_fut = None
+        early_senior_ex = None
+        early_attr = None
+
+        ex = ThreadPoolExecutor(max_workers=len(specialists))
         try:
-            bull_perspective = run_bull(state.analyst_report, verbose=verbose)
-            state.bull_perspective = bull_perspective
-        except Exception as e:
-            error_msg = f"Agente Bull falhou: {e}"
-            state.errors.append(error_msg)
-            if verbose:
-                print(f"   ❌ {error_msg}")
-        
+            futures = [
+                (name, attr, ex.submit(fn, state.analyst_report, verbose=verbose))
+                for name, fn, attr in specialists
+            ]
+
+            if enable_streaming_senior:
+                # Fan-in antecipado: o Senior parte com a 1ª perspectiva
+                # pronta enquanto a outra ainda gera tokens
+                done, _ = wait(
+                    [f for _, _, f in futures],
+                    timeout=SPECIALIST_TIMEOUT_S,
+                    return_when=FIRST_COMPLETED
+                )
+                for name, attr, fut in futures:
+                    if fut in done:
+                        try:
+                            setattr(state, attr, fut.result())
+                            early_attr = attr
+                            early_senior_ex = ThreadPoolExecutor(max_workers=1)
+                            early_senior_fut = early_senior_ex.submit(
+                                run_senior,
+                                analyst_report=state.analyst_report,
+                                bear_perspective=state.bear_perspective,
+                                bull_perspective=state.bull_perspective,
+                                verbose=False
+                            )
+                        except Exception:
+                            pass  # falha cai no tratamento normal do loop
+                        break
+
+            for name, attr, fut in futures:
+                if getattr(state, attr) is not None:
+                    continue  # já coletado no caminho antecipado
+                try:
+                    setattr(state, attr, fut.result(timeout=SPECIALIST_TIMEOUT_S))
+                except FutureTimeoutError:
+                    fut.cancel()
+                    error_msg = f"Agente {name} estourou timeout ({SPECIALIST_TIMEOUT_S}s)"
+                    state.errors.append(error_msg)
+                    if verbose:
+                        log.line(f"   ⏱️ {error_msg}")
+                except Exception as e:
+                    error_msg = f"Agente {name} falhou: {e}"
+                    state.errors.append(error_msg)
+                    if verbose:
+                        log.line(f"   ❌ {error_msg}")
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+
         # Verifica se pelo menos um especialista funcionou
         if not state.bear_perspective and not state.bull_perspective:
             state.errors.append("Ambos especialistas falharam")
@@ -113,108 +330,236 @@ def run_trading_pipeline(
         state.pipeline_status = "specialists_done"
         
         if verbose:
-            print(f"\n   ✅ Especialistas concluíram análise")
+            log.line(f"\n   ✅ Especialistas concluíram análise")
             if state.bear_perspective:
-                print(f"      🐻 Bear: {state.bear_perspective.recommended_action.value.upper()} "
-                      f"(downside: {state.bear_perspective.estimated_downside:.1f}%)")
+                log.line(f"      🐻 Bear: {state.bear_perspective.recommended_action.value.upper()} "
+                         f"(downside: {state.bear_perspective.estimated_downside:.1f}%)")
             if state.bull_perspective:
-                print(f"      🐂 Bull: {state.bull_perspective.recommended_action.value.upper()} "
-                      f"(upside: +{state.bull_perspective.estimated_upside:.1f}%)")
-        
+                log.line(f"      🐂 Bull: {state.bull_perspective.recommended_action.value.upper()} "
+                         f"(upside: +{state.bull_perspective.estimated_upside:.1f}%)")
+
         # ============ STEP 3: SENIOR (DECISÃO FINAL) ============
         if verbose:
-            print(f"\n[STEP 3/3] 👔 Decisão do Senior")
-            print("-" * 70)
-        
+            log.line(f"\n[STEP 3/3] 👔 Decisão do Senior")
+            log.line("-" * 70)
+            log.flush()
+
+        # Resolve o Senior antecipado (se houver): a decisão especulativa
+        # vale quando o especialista que chegou depois concorda com o
+        # veredito; divergência material força a rodada completa
+        senior_decision = None
+        if early_senior_fut is not None:
+            try:
+                early_decision = early_senior_fut.result(timeout=SENIOR_TIMEOUT_S)
+            except Exception:
+                early_decision = None
+            finally:
+                early_senior_ex.shutdown(wait=False, cancel_futures=True)
+
+            if early_decision is not None:
+                late = (state.bull_perspective if early_attr == "bear_perspective"
+                        else state.bear_perspective)
+                if late is not None and late.recommended_action == early_decision.final_verdict:
+                    senior_decision = early_decision
+                    if verbose:
+                        log.line("   ⚡ Decisão antecipada confirmada pelo 2º especialista")
+
         try:
-            senior_decision = run_senior(
-                analyst_report=state.analyst_report,
-                bear_perspective=state.bear_perspective,
-                bull_perspective=state.bull_perspective,
-                verbose=verbose
-            )
+            if senior_decision is None:
+                ex = ThreadPoolExecutor(max_workers=1)
+                fut_senior = ex.submit(
+                    run_senior,
+                    analyst_report=state.analyst_report,
+                    bear_perspective=state.bear_perspective,
+                    bull_perspective=state.bull_perspective,
+                    verbose=verbose
+                )
+                try:
+                    senior_decision = fut_senior.result(timeout=SENIOR_TIMEOUT_S)
+                except FutureTimeoutError:
+                    fut_senior.cancel()
+                    state.errors.append(f"Agente Senior estourou timeout ({SENIOR_TIMEOUT_S}s)")
+                    state.pipeline_status = "timeout"
+                    if verbose:
+                        log.line(f"   ⏱️ Senior estourou timeout ({SENIOR_TIMEOUT_S}s)")
+                    return state
+                finally:
+                    ex.shutdown(wait=False, cancel_futures=True)
             state.senior_decision = senior_decision
             state.pipeline_status = "completed"
             
             if verbose:
-                print(f"\n   ✅ Decisão Final do Senior")
-                print(f"      Veredito: {senior_decision.final_verdict.value.upper()}")
-                print(f"      Tamanho da Posição: {senior_decision.position_size:.1f}%")
-                print(f"      Horizonte: {senior_decision.holding_period}")
-                
+                log.line(f"\n   ✅ Decisão Final do Senior")
+                log.line(f"      Veredito: {senior_decision.final_verdict.value.upper()}")
+                log.line(f"      Tamanho da Posição: {senior_decision.position_size:.1f}%")
+                log.line(f"      Horizonte: {senior_decision.holding_period}")
+
         except Exception as e:
             error_msg = f"Agente Senior falhou: {e}"
             state.errors.append(error_msg)
             state.pipeline_status = "failed"
             if verbose:
-                print(f"   ❌ {error_msg}")
-        
+                log.line(f"   ❌ {error_msg}")
+
     except Exception as e:
         state.errors.append(f"Erro crítico no pipeline: {e}")
         state.pipeline_status = "failed"
         if verbose:
-            print(f"\n❌ Erro crítico: {e}")
-    
+            log.line(f"\n❌ Erro crítico: {e}")
+
     finally:
-        state.execution_time_seconds = time.time() - start_time
-        
+        state.execution_time_seconds = time.perf_counter() - start_time
+
+        # Só estados completos entram no cache: falhas parciais devem ser
+        # re-tentadas na próxima invocação
+        if state.pipeline_status == "completed":
+            _pipeline_cache_set(cache_key, state)
+
         if verbose:
-            print("\n" + "="*70)
-            print(f"⏱️ Pipeline concluído em {state.execution_time_seconds:.2f}s")
-            print(f"📊 Status final: {state.pipeline_status}")
+            log.line("\n" + "="*70)
+            log.line(f"⏱️ Pipeline concluído em {state.execution_time_seconds:.2f}s")
+            log.line(f"📊 Status final: {state.pipeline_status}")
             if state.warnings:
-                print(f"⚠️ Avisos: {len(state.warnings)}")
+                log.line(f"⚠️ Avisos: {len(state.warnings)}")
             if state.errors:
-                print(f"❌ Erros: {len(state.errors)}")
-            print("="*70)
-    
+                log.line(f"❌ Erros: {len(state.errors)}")
+            log.line("="*70)
+        # Único write pendente: cobre também os returns antecipados
+        log.flush()
+
+        # Linha estruturada no stderr (sempre, não só no verbose): deixa
+        # um agregador externo medir p50/p95/p99 e taxa de erro sem
+        # raspar o pretty-print do stdout com regex
+        sys.stderr.write(json.dumps({
+            "evt": "pipeline_done",
+            "ticker": ticker,
+            "as_of": state.as_of,
+            "status": state.pipeline_status,
+            "elapsed_s": round(state.execution_time_seconds, 3),
+            "n_errors": len(state.errors),
+            "n_warnings": len(state.warnings),
+        }) + "\n")
+
     return state
 
 
+async def run_trading_pipeline_async(
+    ticker: str,
+    as_of: Optional[str] = None,
+    min_confidence: float = 0.7,
+    hard_min_confidence: Optional[float] = None,
+    enable_streaming_senior: bool = False,
+    verbose: bool = True
+) -> TradingState:
+    """
+    Entrada async do pipeline: delega a versão síncrona para uma thread,
+    sem bloquear o event loop do chamador.
+
+    Args:
+        ticker: Símbolo da ação (ex: PETR4.SA)
+        as_of: Data de referência YYYY-MM-DD (None = hoje)
+        min_confidence: Confiança mínima para prosseguir (0-1)
+        hard_min_confidence: Piso de corte dos especialistas
+            (None = min_confidence/2)
+        enable_streaming_senior: Dispara o Senior com a 1ª perspectiva
+            pronta (ver run_trading_pipeline)
+        verbose: Se True, imprime progresso
+
+    Returns:
+        TradingState com todos os outputs dos agentes
+    """
+    return await asyncio.to_thread(
+        run_trading_pipeline,
+        ticker,
+        as_of=as_of,
+        min_confidence=min_confidence,
+        hard_min_confidence=hard_min_confidence,
+        enable_streaming_senior=enable_streaming_senior,
+        verbose=verbose
+    )
+
+
+def _print_summary(state: TradingState) -> None:
+    """
+    Imprime o bloco de resumo de um TradingState.
+
+    As linhas são acumuladas e escritas num único write: 1 syscall por
+    resumo em vez de 10+, o que importa quando o batch despeja milhares
+    de resumos num pipe.
+    """
+    # Locals evitam re-percorrer a cadeia de atributos do state (um
+    # LOAD_ATTR por campo por linha) a cada resumo do batch
+    ar = state.analyst_report
+    bear = state.bear_perspective
+    bull = state.bull_perspective
+    sd = state.senior_decision
+
+    lines = [
+        "\n" + "="*70,
+        f"📋 RESUMO DA ANÁLISE: {state.ticker}",
+        "="*70,
+    ]
+
+    if ar:
+        lines.append(f"\n📊 Analista: {ar.verdict.value.upper()} (score: {ar.score:.1f})")
+
+    if bear:
+        lines.append(f"🐻 Bear: {bear.recommended_action.value.upper()} "
+                     f"(downside: {bear.estimated_downside:.1f}%, "
+                     f"prob: {bear.downside_probability:.0%})")
+
+    if bull:
+        lines.append(f"🐂 Bull: {bull.recommended_action.value.upper()} "
+                     f"(upside: +{bull.estimated_upside:.1f}%, "
+                     f"prob: {bull.upside_probability:.0%})")
+
+    if sd:
+        lines.append(f"\n👔 Decisão Final: {sd.final_verdict.value.upper()}")
+        lines.append(f"   Tamanho da Posição: {sd.position_size:.1f}%")
+        lines.append(f"   Horizonte: {sd.holding_period}")
+        lines.append(f"   Confiança: {sd.confidence:.0%}")
+
+    lines.append(f"\n⏱️ Tempo total: {state.execution_time_seconds:.2f}s")
+    lines.append("\n" + "="*70)
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 # ============ TESTE ============
 
 if __name__ == "__main__":
     import argparse
-    
+    from concurrent.futures import ProcessPoolExecutor
+
     parser = argparse.ArgumentParser(description="Pipeline Multi-Agente de Trading")
     parser.add_argument("--ticker", type=str, default="PETR4.SA", help="Ticker da ação")
+    parser.add_argument("--tickers", type=str,
+                        help="Lista de tickers separados por vírgula (batch em paralelo)")
     parser.add_argument("--as-of", type=str, help="Data de referência (YYYY-MM-DD)")
     parser.add_argument("--quiet", action="store_true", help="Modo silencioso")
-    
+
     args = parser.parse_args()
-    
-    # Executa pipeline
-    state = run_trading_pipeline(
-        ticker=args.ticker,
-        as_of=args.as_of,
-        verbose=not args.quiet
-    )
-    
-    # Summary
-    print("\n" + "="*70)
-    print("📋 RESUMO DA ANÁLISE")
-    print("="*70)
-    
-    if state.analyst_report:
-        print(f"\n📊 Analista: {state.analyst_report.verdict.value.upper()} "
-              f"(score: {state.analyst_report.score:.1f})")
-    
-    if state.bear_perspective:
-        print(f"🐻 Bear: {state.bear_perspective.recommended_action.value.upper()} "
-              f"(downside: {state.bear_perspective.estimated_downside:.1f}%, "
-              f"prob: {state.bear_perspective.downside_probability:.0%})")
-    
-    if state.bull_perspective:
-        print(f"🐂 Bull: {state.bull_perspective.recommended_action.value.upper()} "
-              f"(upside: +{state.bull_perspective.estimated_upside:.1f}%, "
-              f"prob: {state.bull_perspective.upside_probability:.0%})")
-    
-    if state.senior_decision:
-        print(f"\n👔 Decisão Final: {state.senior_decision.final_verdict.value.upper()}")
-        print(f"   Tamanho da Posição: {state.senior_decision.position_size:.1f}%")
-        print(f"   Horizonte: {state.senior_decision.holding_period}")
-        print(f"   Confiança: {state.senior_decision.confidence:.0%}")
-    
-    print(f"\n⏱️ Tempo total: {state.execution_time_seconds:.2f}s")
 
-    print("\n" + "="*70)
+    tickers = ([t.strip() for t in args.tickers.split(",") if t.strip()]
+               if args.tickers else [args.ticker])
+
+    if len(tickers) > 1:
+        # Batch: um processo por ticker amortiza import/init do cliente LLM
+        # e usa todos os cores; SP3CTRON_MAX_PARALLEL limita a largura para
+        # respeitar rate limit de API
+        max_parallel = int(os.environ.get("SP3CTRON_MAX_PARALLEL", os.cpu_count() or 1))
+        workers = min(max_parallel, len(tickers))
+
+        run = functools.partial(run_trading_pipeline, as_of=args.as_of, verbose=False)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(run, tickers))
+
+        for state in results:
+            _print_summary(state)
+    else:
+        state = run_trading_pipeline(
+            ticker=tickers[0],
+            as_of=args.as_of,
+            verbose=not args.quiet
+        )
+        _print_summary(state)
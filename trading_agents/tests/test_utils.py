@@ -4,9 +4,14 @@ Testes unitários para yfinance_utils.
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# __file__ já é absoluto na importação; o guard evita re-inserir
+_p = os.path.dirname(os.path.dirname(__file__))
+if _p not in sys.path:
+    sys.path.insert(0, _p)
 
-from data.yfinance_utils import safe_div, validate_snapshot
+import numpy as np
+
+from data.yfinance_utils import safe_div, safe_div_vec, validate_snapshot
 
 
 def test_safe_div():
@@ -18,6 +23,25 @@ def test_safe_div():
     print("✅ safe_div: OK")
 
 
+def test_safe_div_vec():
+    """Testa divisão vetorizada contra a versão escalar"""
+    rng = np.random.default_rng(42)
+    num = rng.random(10_000)
+    den = rng.random(10_000)
+    den[::7] = 0.0  # força o caminho do divisor zero
+
+    out = np.empty_like(num)
+    safe_div_vec(num, den, out)
+
+    for i in (0, 1, 7, 14, 9_999):
+        expected = safe_div(num[i], den[i])
+        if expected is None:
+            assert np.isnan(out[i])
+        else:
+            assert abs(out[i] - expected) < 1e-12
+    print("✅ safe_div_vec: OK")
+
+
 def test_validate_snapshot():
     """Testa validação de snapshot"""
     
@@ -48,6 +72,7 @@ def test_validate_snapshot():
 
 if __name__ == "__main__":
     test_safe_div()
+    test_safe_div_vec()
     test_validate_snapshot()
     print("\n🎉 Todos os testes passaram!")
     